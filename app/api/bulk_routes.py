@@ -0,0 +1,126 @@
+from typing import Annotated, Optional
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import logging
+
+from app.core.bulk_export import BULK_FORMATS, STREAMING_FORMATS, BulkTable, bulk_exports
+from app.core.conditional import check_not_modified, dataset_versions, rows_digest
+from app.scraping.registry import TABS, iter_csv_rows
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+def validate_bulk_target(tab: str, category: Optional[str]):
+    if tab not in TABS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid tab. Available tabs: {', '.join(TABS)}"
+        )
+
+    categories = TABS[tab]["categories"]
+    if categories is None and category is not None:
+        raise HTTPException(status_code=400, detail=f"The {tab} tab has no categories.")
+    if categories is not None and category not in categories:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid category. Available categories: {', '.join(categories)}"
+        )
+
+
+async def bulk_response(request: Request, response: Response, tab: str, category: Optional[str], fmt: str):
+    logger.info(f"Request: Bulk {fmt} export for tab='{tab}', category='{category}'")
+
+    validate_bulk_target(tab, category)
+
+    key = (tab, category)
+    table = await run_in_threadpool(
+        bulk_exports.table,
+        key,
+        lambda: BulkTable(TABS[tab]["fields"], iter_csv_rows(tab, category))
+    )
+
+    version = await dataset_versions.observe(("bulk", tab, category), table, lambda t: rows_digest(t.columns))
+    not_modified = check_not_modified(request, response, version, TABS[tab]["end_year"])
+    if not_modified is not None:
+        return not_modified
+
+    _, media_type, extension = BULK_FORMATS[fmt]
+    filename = "_".join(part for part in (tab, category) if part) + f".{extension}"
+    headers = dict(response.headers)
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    # The first download of a CSV/NDJSON file is streamed as it is rendered;
+    # later ones send the stored bytes with Content-Length.
+    payload = bulk_exports.cached_payload(key, fmt)
+    if payload is None and fmt in STREAMING_FORMATS:
+        return StreamingResponse(bulk_exports.stream(key, fmt, table), media_type=media_type, headers=headers)
+
+    if payload is None:
+        try:
+            payload = await run_in_threadpool(bulk_exports.payload, key, fmt, table)
+        except ImportError as e:
+            raise HTTPException(status_code=501, detail=str(e))
+
+    return Response(content=payload, media_type=media_type, headers=headers)
+
+
+BULK_DESCRIPTION = f"""
+    Download the **entire normalized history** of a tab (and category) in one file,
+    built from the in-memory dataset store.
+
+    - **tab**: Must be one of: {", ".join(TABS)}
+    - **format**: `csv` (gzip-compressed), `ndjson`, `arrow` (Arrow IPC stream) or `parquet`.
+      Arrow and Parquet require pyarrow.
+
+    Responses carry `Content-Length`, `ETag`, `Last-Modified` and `Cache-Control` headers.
+    """
+
+BULK_RESPONSES = {
+    200: {"description": "Bulk dataset file."},
+    304: {"description": "Data unchanged since the cached copy identified by If-None-Match / If-Modified-Since."},
+    400: {"description": "Invalid tab or category."},
+    501: {"description": "The requested format is not available (pyarrow is not installed)."}
+}
+
+FORMAT_QUERY = Query("csv", pattern=f"^({'|'.join(BULK_FORMATS)})$", description="File format")
+
+
+@router.get(
+    "/{tab}",
+    summary="Bulk download for a tab without categories",
+    description=BULK_DESCRIPTION,
+    response_description="Normalized dataset file",
+    responses=BULK_RESPONSES
+)
+async def get_bulk_tab(
+    tab: Annotated[str, Path(description="Tab to download (production or commercialization)")],
+    request: Request,
+    response: Response,
+    format: str = FORMAT_QUERY
+):
+    """
+    Download every year of a tab without categories.
+    """
+    return await bulk_response(request, response, tab, None, format)
+
+
+@router.get(
+    "/{tab}/{category}",
+    summary="Bulk download for a tab category",
+    description=BULK_DESCRIPTION,
+    response_description="Normalized dataset file",
+    responses=BULK_RESPONSES
+)
+async def get_bulk_tab_category(
+    tab: Annotated[str, Path(description="Tab to download (processing, import or export)")],
+    category: Annotated[str, Path(description="Category of the tab")],
+    request: Request,
+    response: Response,
+    format: str = FORMAT_QUERY
+):
+    """
+    Download every year of a tab category.
+    """
+    return await bulk_response(request, response, tab, category, format)
@@ -1,11 +1,18 @@
-from typing import Annotated
-from fastapi import APIRouter, HTTPException, Path, Query, status
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response, status
 from fastapi.responses import JSONResponse
 import logging
 
-from app.core.constants import EXPORT_START_YEAR, EXPORT_END_YEAR, EXPORT_CATEGORY_MAP
-from app.core.utils import validate_category, validate_year
+from app.core.conditional import check_cached_not_modified, check_not_modified, dataset_versions
+from app.core.constants import EXPORT_START_YEAR, EXPORT_END_YEAR, EXPORT_CATEGORY_MAP, EXPORT_CSV_COLUMNS
+from app.core.pipeline import ndjson_response, paginate, take_page
+from app.core.range_query import load_range_matrix, matrix_digest, summarize_range
+from app.core.result_index import result_index
+from app.core.row_query import RowIndex, query_rows
+from app.core.serialization import json_response
+from app.core.utils import validate_category, validate_sort_key, validate_year, validate_year_range
 from app.scraping.export_tab import format_export_data, get_export_data
+from app.scraping.registry import iter_all_rows
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -22,12 +29,17 @@ router = APIRouter()
     Optional query parameters:
     - `offset`: Number of records to skip (for pagination).
     - `limit`: Maximum number of records to return (default: 100, max: 1000).
+    - `country`: Only return these countries (repeatable, case-insensitive).
+    - `sort_by`: Sort by one of: amount, value, country.
+    - `order`: Sort direction, `desc` (default) or `asc`.
+    - `top`: Keep only the first N rows after sorting (by amount unless `sort_by` is given).
 
     Returns formatted export data, or a 204 status code if no data exists.
     """,
     response_description="List of formatted export data",
     responses={
         200: {"description": "Export data retrieved successfully."},
+        304: {"description": "Data unchanged since the cached copy identified by If-None-Match / If-Modified-Since."},
         204: {"description": "No export data available for the given category and year."},
         400: {"description": "Invalid category or year."},
         500: {"description": "Internal server error while retrieving export data."}
@@ -36,8 +48,14 @@ router = APIRouter()
 async def get_export_data_by_category_year(
     category: Annotated[str, Path(description="Category of the data to export")],
     year: Annotated[int, Path(description=f"Year between {EXPORT_START_YEAR} and {EXPORT_END_YEAR}")],
+    request: Request,
+    response: Response,
     offset: int = Query(0, ge=0, description="Number of items to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return"),
+    country: Optional[List[str]] = Query(None, description="Only return these countries"),
+    sort_by: Optional[str] = Query(None, description="Row key to sort by"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort direction"),
+    top: Optional[int] = Query(None, ge=1, le=1000, description="Keep only the first N rows after sorting")
 ):
     """
     Get formatted export data for a specific category and year.
@@ -49,22 +67,37 @@ async def get_export_data_by_category_year(
     try:
         validate_category(category, allowed_categories)
         validate_year(year, EXPORT_START_YEAR, EXPORT_END_YEAR)
+        validate_sort_key(sort_by, ["amount", "value", "country"])
     except ValueError as e:
         logger.warning(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
-    data = get_export_data(category, year)
+    not_modified = check_cached_not_modified(request, response, ("export", category, year))
+    if not_modified is not None:
+        return not_modified
+
+    data = await get_export_data(category, year)
     if data is None:
         logger.error(f"Failed to retrieve raw export data for category='{category}', year={year}")
         raise HTTPException(status_code=500, detail="Failed to retrieve export data.")
 
-    formatted = format_export_data(data, year)
+    index = result_index.get(
+        ("export", category, year, False),
+        data,
+        lambda rows: RowIndex(format_export_data(rows, year), "country")
+    )
+    version = await dataset_versions.observe(("export", category, year), index.rows, origin=data)
+    not_modified = check_not_modified(request, response, version, year)
+    if not_modified is not None:
+        return not_modified
+
+    formatted = query_rows(index, country, None, sort_by, order, top)
 
     if not formatted:
         return JSONResponse(content=[], status_code=status.HTTP_204_NO_CONTENT)
 
     paginated_data = formatted[offset:offset + limit]
-    return paginated_data
+    return json_response(paginated_data, headers=response.headers)
 
 @router.get(
     "/all",
@@ -78,6 +111,9 @@ async def get_export_data_by_category_year(
     Optional query parameters:
     - `offset`: Number of records to skip (for pagination).
     - `limit`: Maximum number of records to return (default: 100, max: 1000).
+    - `stream`: When true, rows are streamed as NDJSON as soon as each year is fetched.
+
+    Fetching stops as soon as `offset + limit` rows have been produced.
     """,
     response_description="List of all formatted export data",
     responses={
@@ -88,36 +124,80 @@ async def get_export_data_by_category_year(
 )
 async def get_all_export_data(
     offset: int = Query(0, ge=0, description="Number of items to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return"),
+    stream: bool = Query(False, description="Stream rows as NDJSON while each year is fetched")
 ):
     """
     Get all available export data across all valid categories and years.
     """
+    logger.info("Starting full export data retrieval.")
+
+    rows = iter_all_rows("export")
+    if stream:
+        return ndjson_response(paginate(rows, offset, limit))
+
+    paginated_data, total_seen = await take_page(rows, offset, limit)
+    if not total_seen:
+        return JSONResponse(content=[], status_code=status.HTTP_204_NO_CONTENT)
+
+    return json_response(paginated_data)
+
+@router.get(
+    "/{category}",
+    summary="Export data by category over a range of years",
+    description=f"""
+    Retrieve export data for a **specific category across a range of years**,
+    aggregated over the columnar in-memory dataset.
+
+    - **category**: Must be one of: {", ".join(EXPORT_CATEGORY_MAP.keys())}
+    - **start** / **end**: Must be between {EXPORT_START_YEAR} and {EXPORT_END_YEAR} (default: full range)
+
+    Optional query parameters:
+    - `totals`: Include per-country totals over the range.
+    - `deltas`: Include year-over-year changes for every year in the range.
+    - `top`: Keep only the N countries with the largest total amount.
+
+    Returns one yearly series per country, or a 204 status code if no data exists.
+    """,
+    response_description="Yearly export series per country",
+    responses={
+        200: {"description": "Export range data retrieved successfully."},
+        304: {"description": "Data unchanged since the cached copy identified by If-None-Match / If-Modified-Since."},
+        204: {"description": "No export data available for the given category and years."},
+        400: {"description": "Invalid category or year range."},
+        501: {"description": "Range queries are not available (numpy is not installed)."}
+    }
+)
+async def get_export_data_by_category_range(
+    category: Annotated[str, Path(description="Category of the data to export")],
+    request: Request,
+    response: Response,
+    start: int = Query(EXPORT_START_YEAR, description="First year of the range"),
+    end: int = Query(EXPORT_END_YEAR, description="Last year of the range"),
+    totals: bool = Query(False, description="Include totals over the range"),
+    deltas: bool = Query(False, description="Include year-over-year changes"),
+    top: Optional[int] = Query(None, ge=1, le=1000, description="Keep only the N largest by total amount")
+):
+    """
+    Get yearly export series for a category over a range of years.
+    """
     allowed_categories = list(EXPORT_CATEGORY_MAP)
-    all_data = []
 
-    logger.info("Starting full export data retrieval.")
+    logger.info(f"Request: Export data for category='{category}', years={start}-{end}")
+
+    validate_category(category, allowed_categories)
+    validate_year_range(start, end, EXPORT_START_YEAR, EXPORT_END_YEAR)
+
+    matrix = load_range_matrix(EXPORT_CATEGORY_MAP[category]["data_path"], EXPORT_CSV_COLUMNS[0])
+    version = await dataset_versions.observe(("export", category, "range"), matrix, matrix_digest)
+    not_modified = check_not_modified(request, response, version, end)
+    if not_modified is not None:
+        return not_modified
+
+    summary = summarize_range(matrix, start, end, "country", totals=totals, deltas=deltas, top=top)
 
-    for category in allowed_categories:
-        for year in range(EXPORT_START_YEAR, EXPORT_END_YEAR + 1):
-            try:
-                data = get_export_data(category, year)
-                if data is None:
-                    continue
-
-                formatted = format_export_data(
-                    data,
-                    year,
-                    category=EXPORT_CATEGORY_MAP[category]["name"],
-                    include_year_and_category=True
-                )
-                all_data.extend(formatted)
-            except Exception as e:
-                logger.warning(f"Error processing category='{category}', year={year}: {e}")
-                continue
-
-    if not all_data:
+    if not summary["items"]:
         return JSONResponse(content=[], status_code=status.HTTP_204_NO_CONTENT)
 
-    paginated_data = all_data[offset:offset + limit]
-    return paginated_data
+    summary["category"] = EXPORT_CATEGORY_MAP[category]["name"]
+    return json_response(summary, headers=response.headers)
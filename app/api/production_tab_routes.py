@@ -1,11 +1,18 @@
-from typing import Annotated
-from fastapi import APIRouter, HTTPException, Path, Query, status
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response, status
 from fastapi.responses import JSONResponse
 import logging
 
-from app.core.constants import PRODUCTION_START_YEAR, PRODUCTION_END_YEAR
-from app.core.utils import validate_year
+from app.core.conditional import check_cached_not_modified, check_not_modified, dataset_versions
+from app.core.constants import PRODUCTION_START_YEAR, PRODUCTION_END_YEAR, PRODUCTION_CSV_PATH, PRODUCTION_CSV_COLUMNS
+from app.core.pipeline import ndjson_response, paginate, take_page
+from app.core.range_query import load_range_matrix, matrix_digest, summarize_range
+from app.core.result_index import result_index
+from app.core.row_query import RowIndex, query_rows
+from app.core.serialization import json_response
+from app.core.utils import validate_sort_key, validate_year, validate_year_range
 from app.scraping.production_tab import format_production_data, get_production_data
+from app.scraping.registry import iter_all_rows
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -21,6 +28,9 @@ router = APIRouter()
     Optional query parameters:
     - `offset`: Number of records to skip (for pagination).
     - `limit`: Maximum number of records to return (default: 100, max: 1000).
+    - `stream`: When true, rows are streamed as NDJSON as soon as each year is fetched.
+
+    Fetching stops as soon as `offset + limit` rows have been produced.
     """,
     response_description="List of all formatted production data",
     responses={
@@ -31,36 +41,77 @@ router = APIRouter()
 )
 async def get_all_production_data(
     offset: int = Query(0, ge=0, description="Number of items to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return"),
+    stream: bool = Query(False, description="Stream rows as NDJSON while each year is fetched")
 ):
     """
     Get all available production data across all valid years.
     """
-    all_data = []
-
     logger.info("Starting full production data retrieval.")
 
-    for year in range(PRODUCTION_START_YEAR, PRODUCTION_END_YEAR + 1):
-        try:
-            data = get_production_data(year)
-            if data is None:
-                continue
-
-            formatted = format_production_data(
-                data,
-                year,
-                include_year=True
-            )
-            all_data.extend(formatted)
-        except Exception as e:
-            logger.warning(f"Error processing year={year}: {e}")
-            continue
-
-    if not all_data:
+    rows = iter_all_rows("production")
+    if stream:
+        return ndjson_response(paginate(rows, offset, limit))
+
+    paginated_data, total_seen = await take_page(rows, offset, limit)
+    if not total_seen:
         return JSONResponse(content=[], status_code=status.HTTP_204_NO_CONTENT)
 
-    paginated_data = all_data[offset:offset + limit]
-    return paginated_data
+    return json_response(paginated_data)
+
+@router.get(
+    "/range",
+    summary="Production data over a range of years",
+    description=f"""
+    Retrieve production data **across a range of years**, aggregated over the
+    columnar in-memory dataset.
+
+    - **start** / **end**: Must be between {PRODUCTION_START_YEAR} and {PRODUCTION_END_YEAR} (default: full range)
+
+    Optional query parameters:
+    - `totals`: Include per-product totals over the range.
+    - `deltas`: Include year-over-year changes for every year in the range.
+    - `top`: Keep only the N products with the largest total amount.
+
+    Returns one yearly series per product, or a 204 status code if no data exists.
+    """,
+    response_description="Yearly production series per product",
+    responses={
+        200: {"description": "Production range data retrieved successfully."},
+        304: {"description": "Data unchanged since the cached copy identified by If-None-Match / If-Modified-Since."},
+        204: {"description": "No production data available for the given years."},
+        400: {"description": "Invalid year range."},
+        501: {"description": "Range queries are not available (numpy is not installed)."}
+    }
+)
+async def get_production_data_by_range(
+    request: Request,
+    response: Response,
+    start: int = Query(PRODUCTION_START_YEAR, description="First year of the range"),
+    end: int = Query(PRODUCTION_END_YEAR, description="Last year of the range"),
+    totals: bool = Query(False, description="Include totals over the range"),
+    deltas: bool = Query(False, description="Include year-over-year changes"),
+    top: Optional[int] = Query(None, ge=1, le=1000, description="Keep only the N largest by total amount")
+):
+    """
+    Get yearly production series over a range of years.
+    """
+    logger.info(f"Request: Production data for years={start}-{end}")
+
+    validate_year_range(start, end, PRODUCTION_START_YEAR, PRODUCTION_END_YEAR)
+
+    matrix = load_range_matrix(PRODUCTION_CSV_PATH, PRODUCTION_CSV_COLUMNS[0])
+    version = await dataset_versions.observe(("production", None, "range"), matrix, matrix_digest)
+    not_modified = check_not_modified(request, response, version, end)
+    if not_modified is not None:
+        return not_modified
+
+    summary = summarize_range(matrix, start, end, "product", totals=totals, deltas=deltas, top=top)
+
+    if not summary["items"]:
+        return JSONResponse(content=[], status_code=status.HTTP_204_NO_CONTENT)
+
+    return json_response(summary, headers=response.headers)
 
 @router.get(
     "/{year}",
@@ -73,12 +124,18 @@ async def get_all_production_data(
     Optional query parameters:
     - `offset`: Number of records to skip (for pagination).
     - `limit`: Maximum number of records to return (default: 100, max: 1000).
+    - `product`: Only return these products (repeatable, case-insensitive).
+    - `type`: Only return rows from these type groups (repeatable, case-insensitive).
+    - `sort_by`: Sort by one of: amount, product.
+    - `order`: Sort direction, `desc` (default) or `asc`.
+    - `top`: Keep only the first N rows after sorting (by amount unless `sort_by` is given).
 
     Returns formatted production data, or a 204 status code if no data exists.
     """,
     response_description="List of formatted production data",
     responses={
         200: {"description": "Production data retrieved successfully."},
+        304: {"description": "Data unchanged since the cached copy identified by If-None-Match / If-Modified-Since."},
         204: {"description": "No production data available for the year."},
         400: {"description": "Invalid year."},
         500: {"description": "Internal server error while retrieving production data."}
@@ -86,8 +143,15 @@ async def get_all_production_data(
 )
 async def get_production_data_by_year(
     year: Annotated[int, Path(description=f"Year between {PRODUCTION_START_YEAR} and {PRODUCTION_END_YEAR}")],
+    request: Request,
+    response: Response,
     offset: int = Query(0, ge=0, description="Number of items to skip"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return"),
+    product: Optional[List[str]] = Query(None, description="Only return these products"),
+    type_: Optional[List[str]] = Query(None, alias="type", description="Only return rows from these type groups"),
+    sort_by: Optional[str] = Query(None, description="Row key to sort by"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort direction"),
+    top: Optional[int] = Query(None, ge=1, le=1000, description="Keep only the first N rows after sorting")
 ):
     """
     Get formatted production data for a specific year.
@@ -96,21 +160,36 @@ async def get_production_data_by_year(
 
     try:
         validate_year(year, PRODUCTION_START_YEAR, PRODUCTION_END_YEAR)
+        validate_sort_key(sort_by, ["amount", "product"])
     except ValueError as e:
         logger.warning(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
 
-    data = get_production_data(year)
+    not_modified = check_cached_not_modified(request, response, ("production", None, year))
+    if not_modified is not None:
+        return not_modified
+
+    data = await get_production_data(year)
     if data is None:
         logger.error(f"Failed to retrieve raw production data for year={year}")
         raise HTTPException(status_code=500, detail="Failed to retrieve production data.")
 
-    formatted = format_production_data(data, year)
+    index = result_index.get(
+        ("production", None, year, False),
+        data,
+        lambda rows: RowIndex(format_production_data(rows, year), "product")
+    )
+    version = await dataset_versions.observe(("production", None, year), index.rows, origin=data)
+    not_modified = check_not_modified(request, response, version, year)
+    if not_modified is not None:
+        return not_modified
+
+    formatted = query_rows(index, product, type_, sort_by, order, top)
 
     if not formatted:
         return JSONResponse(content=[], status_code=status.HTTP_204_NO_CONTENT)
 
     paginated_data = formatted[offset:offset + limit]
-    return paginated_data
+    return json_response(paginated_data, headers=response.headers)
 
 
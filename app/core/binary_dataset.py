@@ -0,0 +1,356 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core.constants import BINARY_DATASET_PATH
+from app.core.dataset_store import CsvDataset, register_csv_dataset
+from app.core.utils import amount_or_none
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"VITIBIN\0"
+FORMAT_VERSION = 2
+MISSING = -(2 ** 63)
+ALIGNMENT = 8
+
+# magic, format version, header length
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def normalize_amount(value: Optional[str]) -> int:
+    """Like ``utils.amount_or_none``, with MISSING for cells that are not numbers."""
+    amount = amount_or_none(value)
+    return amount if amount is not None else MISSING
+
+
+class TableData:
+    """One normalized tab/category ready to be written: labels plus year-major int64 columns."""
+
+    def __init__(
+        self,
+        key: str,
+        tab: str,
+        category: Optional[str],
+        label_column: str,
+        years: List[int],
+        labels: List[str],
+        amount: List[List[int]],
+        value: Optional[List[List[int]]] = None,
+    ):
+        self.key = key
+        self.tab = tab
+        self.category = category
+        self.label_column = label_column
+        self.years = years
+        self.labels = labels
+        self.amount = amount
+        self.value = value
+
+
+def table_from_rows(
+    key: str,
+    tab: str,
+    category: Optional[str],
+    label_column: str,
+    rows_by_year: Dict[int, List[dict]],
+) -> TableData:
+    """Align per-year rows (scraped or CSV) into one label list.
+
+    Rows are matched by (group header, label), since the same label can appear
+    under several groups (e.g. ``Tinto`` under each wine type). A label first
+    seen in a later year is placed right after the row that precedes it in
+    that year, so it stays inside its group.
+    """
+    years = sorted(year for year, rows in rows_by_year.items() if rows)
+    order: List[Tuple[str, str]] = []
+    known = set()
+    cells: Dict[Tuple[int, Tuple[str, str]], Tuple[str, Optional[str]]] = {}
+    has_value = False
+
+    for year_position, year in enumerate(years):
+        group = ""
+        previous: Optional[Tuple[str, str]] = None
+        for row in rows_by_year[year]:
+            label = row[label_column].strip()
+            if label.isupper():
+                group = label
+            row_key = (group, label)
+            if row_key not in known:
+                known.add(row_key)
+                order.insert(order.index(previous) + 1 if previous is not None else 0, row_key)
+            previous = row_key
+
+            if f"{year}_1" in row:
+                has_value = True
+                cells[(year_position, row_key)] = (row[f"{year}_1"], row.get(f"{year}_2"))
+            else:
+                cells[(year_position, row_key)] = (row.get(f"{year}"), None)
+
+    positions = {row_key: position for position, row_key in enumerate(order)}
+    labels = [label for _, label in order]
+    amount = [[MISSING] * len(labels) for _ in years]
+    value = [[MISSING] * len(labels) for _ in years] if has_value else None
+    for (year_position, row_key), (amount_cell, value_cell) in cells.items():
+        position = positions[row_key]
+        amount[year_position][position] = normalize_amount(amount_cell)
+        if value is not None:
+            value[year_position][position] = normalize_amount(value_cell)
+
+    return TableData(key, tab, category, label_column, years, labels, amount, value)
+
+
+class _Writer:
+    def __init__(self):
+        self.body = bytearray()
+        self.strings: Dict[str, int] = {}
+        self.string_list: List[str] = []
+
+    def intern(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.string_list)
+            self.string_list.append(value)
+        return index
+
+    def append(self, data: bytes) -> int:
+        self.body.extend(b"\0" * (-len(self.body) % ALIGNMENT))
+        offset = len(self.body)
+        self.body.extend(data)
+        return offset
+
+    def append_ints(self, typecode: str, values: Sequence[int]) -> int:
+        data = array(typecode, values)
+        if sys.byteorder != "little":
+            data.byteswap()
+        return self.append(data.tobytes())
+
+    def append_metric(self, columns: List[List[int]]) -> Tuple[int, int]:
+        # Missing cells are stored as 0 plus a flag, so the int64 columns can be
+        # summed in place without masking the sentinel first.
+        flat = [v for column in columns for v in column]
+        missing = [v == MISSING for v in flat]
+        values = self.append_ints("q", [0 if m else v for v, m in zip(flat, missing)])
+        return values, self.append_ints("B", missing)
+
+
+def write_dataset(path: str, tables: List[TableData], source: str) -> dict:
+    """Write ``tables`` as one versioned binary file, atomically replacing ``path``."""
+    writer = _Writer()
+    table_headers = []
+    for table in tables:
+        label_ids = [writer.intern(label) for label in table.labels]
+        entry = {
+            "key": table.key,
+            "tab": table.tab,
+            "category": table.category,
+            "label_column": table.label_column,
+            "years": table.years,
+            "rows": len(table.labels),
+            "labels": writer.append_ints("i", label_ids),
+            "value": None,
+            "value_missing": None,
+        }
+        entry["amount"], entry["amount_missing"] = writer.append_metric(table.amount)
+        if table.value is not None:
+            entry["value"], entry["value_missing"] = writer.append_metric(table.value)
+        table_headers.append(entry)
+
+    encoded = [s.encode("utf-8") for s in writer.string_list]
+    string_offsets = [0]
+    for item in encoded:
+        string_offsets.append(string_offsets[-1] + len(item))
+    strings = {
+        "count": len(encoded),
+        "offsets": writer.append_ints("q", string_offsets),
+        "data": writer.append(b"".join(encoded)),
+    }
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "source": source,
+        "content_hash": hashlib.blake2b(bytes(writer.body), digest_size=16).hexdigest(),
+        "strings": strings,
+        "tables": table_headers,
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    header_bytes += b" " * (-(_PREAMBLE.size + len(header_bytes)) % ALIGNMENT)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(writer.body)
+    os.replace(tmp_path, path)
+    return header
+
+
+def _int_view(buffer: memoryview, offset: int, count: int, typecode: str) -> memoryview:
+    size = array(typecode).itemsize
+    if offset < 0 or offset % size or offset + count * size > len(buffer):
+        raise ValueError(f"column at offset {offset} runs past the end of the file")
+    return buffer[offset:offset + count * size].cast(typecode)
+
+
+class _BinaryColumns:
+    """CsvDataset-style column list rendered lazily from the int64 year columns."""
+
+    def __init__(self, table: "BinaryTable"):
+        self._table = table
+        self._cache: Dict[int, List[str]] = {0: table.labels}
+
+    def __len__(self) -> int:
+        return 1 + len(self._table.years) * self._table.metric_count
+
+    def __getitem__(self, index: int) -> List[str]:
+        column = self._cache.get(index)
+        if column is None:
+            year_position, metric = divmod(index - 1, self._table.metric_count)
+            values = self._table.year_values(year_position, metric)
+            missing = self._table.year_missing(year_position, metric)
+            column = ["-" if m else str(v) for v, m in zip(values, missing)]
+            self._cache[index] = column
+        return column
+
+
+class BinaryTable(CsvDataset):
+    """A table from the binary dataset, usable anywhere a parsed CSV is.
+
+    Year columns are views into the (memory-mapped) file; string columns for
+    ``load_from_csv`` are only rendered for the years that are requested.
+    """
+
+    def __init__(self, entry: dict, buffer: memoryview, strings: List[str]):
+        self.entry = entry
+        self.years: List[int] = entry["years"]
+        self.metric_count = 2 if entry["value"] is not None else 1
+        rows = entry["rows"]
+        cells = rows * len(self.years)
+        label_ids = _int_view(buffer, entry["labels"], rows, "i")
+        if rows and not 0 <= min(label_ids) <= max(label_ids) < len(strings):
+            raise ValueError(f"table {entry['key']} refers to labels outside the string table")
+        self.labels = [strings[i] for i in label_ids]
+        self.amount = _int_view(buffer, entry["amount"], cells, "q")
+        self.amount_missing = _int_view(buffer, entry["amount_missing"], cells, "B")
+        self.value = self.value_missing = None
+        if entry["value"] is not None:
+            self.value = _int_view(buffer, entry["value"], cells, "q")
+            self.value_missing = _int_view(buffer, entry["value_missing"], cells, "B")
+
+        header = [entry["label_column"]]
+        for year in self.years:
+            header.extend([str(year)] * self.metric_count)
+        super().__init__(header, _BinaryColumns(self))
+
+    def year_values(self, year_position: int, metric: int = 0) -> memoryview:
+        """int64 cells of one year; missing cells read as 0 (see ``year_missing``)."""
+        values = self.amount if metric == 0 else self.value
+        rows = self.row_count
+        return values[year_position * rows:(year_position + 1) * rows]
+
+    def year_missing(self, year_position: int, metric: int = 0) -> memoryview:
+        missing = self.amount_missing if metric == 0 else self.value_missing
+        rows = self.row_count
+        return missing[year_position * rows:(year_position + 1) * rows]
+
+
+class BinaryDataset:
+    def __init__(self, path: str, header: dict, tables: Dict[str, BinaryTable], mapping: Optional[mmap.mmap] = None):
+        self.path = path
+        self.header = header
+        self.tables = tables
+        # Kept alive for as long as the table views into it are in use.
+        self.mapping = mapping
+
+    def info(self) -> dict:
+        return {
+            "path": self.path,
+            "format_version": self.header["format_version"],
+            "created_at": self.header["created_at"],
+            "source": self.header["source"],
+            "content_hash": self.header["content_hash"],
+            "tables": len(self.tables),
+            "mapped": self.mapping is not None,
+        }
+
+
+def parse_dataset(path: str, data) -> BinaryDataset:
+    if sys.byteorder != "little":
+        raise ValueError("binary datasets are little-endian")
+
+    buffer = memoryview(data)
+    if len(buffer) < _PREAMBLE.size:
+        raise ValueError(f"{path} is too short to be a binary dataset")
+    magic, version, header_length = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a binary dataset")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path} has format version {version}, expected {FORMAT_VERSION}")
+
+    if _PREAMBLE.size + header_length > len(buffer):
+        raise ValueError(f"{path} is truncated inside its header")
+    header = json.loads(bytes(buffer[_PREAMBLE.size:_PREAMBLE.size + header_length]))
+    body = buffer[_PREAMBLE.size + header_length:]
+
+    string_header = header["strings"]
+    offsets = _int_view(body, string_header["offsets"], string_header["count"] + 1, "q")
+    blob = body[string_header["data"]:]
+    if string_header["count"] and offsets[-1] > len(blob):
+        raise ValueError(f"{path} is truncated inside its string table")
+    strings = [bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(string_header["count"])]
+
+    tables = {entry["key"]: BinaryTable(entry, body, strings) for entry in header["tables"]}
+    return BinaryDataset(path, header, tables)
+
+
+def read_dataset(path: str) -> BinaryDataset:
+    """Map ``path`` read-only; every worker shares the same page-cache pages.
+
+    The ingest CLI replaces the file with ``os.replace``, so a running process
+    keeps reading the old inode until it reloads.
+    """
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    dataset = parse_dataset(path, mapping)
+    dataset.mapping = mapping
+    return dataset
+
+
+_loaded: Optional[BinaryDataset] = None
+
+
+def load_binary_dataset(path: str = BINARY_DATASET_PATH) -> Optional[BinaryDataset]:
+    """Register every table of the dataset file with the CSV store, if the file exists."""
+    global _loaded
+
+    if not os.path.exists(path):
+        return None
+
+    start = time.perf_counter()
+    try:
+        dataset = read_dataset(path)
+    except (OSError, ValueError, KeyError, IndexError, TypeError, struct.error) as e:
+        logger.warning(f"Ignoring binary dataset {path}: {e}")
+        return None
+
+    for key, table in dataset.tables.items():
+        register_csv_dataset(key, table)
+    _loaded = dataset
+
+    logger.info(
+        f"Loaded binary dataset {path} ({len(dataset.tables)} tables, "
+        f"{dataset.header['content_hash']}) in {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+    return dataset
+
+
+def loaded_dataset_info() -> Optional[dict]:
+    return _loaded.info() if _loaded is not None else None
@@ -0,0 +1,160 @@
+import csv
+import io
+import json
+import threading
+import zlib
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from app.core.metrics import stage_timer
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional
+    pyarrow = None
+
+
+class BulkTable:
+    """Column-major copy of a whole normalized tab/category, one list per field."""
+
+    def __init__(self, fields: List[str], rows: Iterable[dict]):
+        self.fields = fields
+        self.columns: Dict[str, list] = {field: [] for field in fields}
+        self.row_count = 0
+        for row in rows:
+            for field in fields:
+                self.columns[field].append(row.get(field))
+            self.row_count += 1
+
+    def iter_rows(self) -> Iterable[dict]:
+        columns = [self.columns[field] for field in self.fields]
+        for values in zip(*columns):
+            yield dict(zip(self.fields, values))
+
+
+CHUNK_ROWS = 5000
+
+
+def _row_chunks(table: BulkTable, chunk_rows: int) -> Iterator[list]:
+    rows = zip(*(table.columns[field] for field in table.fields))
+    while True:
+        chunk = [row for _, row in zip(range(chunk_rows), rows)]
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_csv_gzip(table: BulkTable, chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    # gzip container with a zero mtime, so identical tables give identical bytes.
+    compressor = zlib.compressobj(9, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(table.fields)
+    for chunk in _row_chunks(table, chunk_rows):
+        writer.writerows(chunk)
+        data = compressor.compress(buffer.getvalue().encode("utf-8"))
+        buffer.seek(0)
+        buffer.truncate()
+        if data:
+            yield data
+    yield compressor.compress(buffer.getvalue().encode("utf-8")) + compressor.flush()
+
+
+def iter_ndjson(table: BulkTable, chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    for chunk in _row_chunks(table, chunk_rows):
+        rows = (dict(zip(table.fields, values)) for values in chunk)
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+
+
+def render_csv_gzip(table: BulkTable) -> bytes:
+    return b"".join(iter_csv_gzip(table))
+
+
+def render_ndjson(table: BulkTable) -> bytes:
+    return b"".join(iter_ndjson(table))
+
+
+def _arrow_table(table: BulkTable):
+    if pyarrow is None:
+        raise ImportError("pyarrow is required for Arrow and Parquet exports")
+    return pyarrow.table(table.columns)
+
+
+def render_arrow(table: BulkTable) -> bytes:
+    arrow_table = _arrow_table(table)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, arrow_table.schema) as writer:
+        writer.write_table(arrow_table)
+    return sink.getvalue().to_pybytes()
+
+
+def render_parquet(table: BulkTable) -> bytes:
+    arrow_table = _arrow_table(table)
+    sink = pyarrow.BufferOutputStream()
+    pyarrow.parquet.write_table(arrow_table, sink, compression="zstd")
+    return sink.getvalue().to_pybytes()
+
+
+# format -> chunked renderer; Arrow and Parquet are written by pyarrow in one piece
+STREAMING_FORMATS: Dict[str, Callable[[BulkTable], Iterator[bytes]]] = {
+    "csv": iter_csv_gzip,
+    "ndjson": iter_ndjson,
+}
+
+# format -> (renderer, media type, file extension)
+BULK_FORMATS: Dict[str, Tuple[Callable[[BulkTable], bytes], str, str]] = {
+    "csv": (render_csv_gzip, "application/gzip", "csv.gz"),
+    "ndjson": (render_ndjson, "application/x-ndjson", "ndjson"),
+    "arrow": (render_arrow, "application/vnd.apache.arrow.stream", "arrow"),
+    "parquet": (render_parquet, "application/vnd.apache.parquet", "parquet"),
+}
+
+
+class BulkExportCache:
+    """Whole-dataset tables and their rendered payloads, built once per key."""
+
+    def __init__(self):
+        self._tables: Dict[Hashable, BulkTable] = {}
+        self._payloads: Dict[Tuple[Hashable, str], bytes] = {}
+        self._lock = threading.Lock()
+
+    def table(self, key: Hashable, build: Callable[[], BulkTable]) -> BulkTable:
+        with self._lock:
+            table = self._tables.get(key)
+        if table is None:
+            table = build()
+            with self._lock:
+                table = self._tables.setdefault(key, table)
+        return table
+
+    def cached_payload(self, key: Hashable, fmt: str) -> Optional[bytes]:
+        with self._lock:
+            return self._payloads.get((key, fmt))
+
+    def stream(self, key: Hashable, fmt: str, table: BulkTable) -> Iterator[bytes]:
+        """Yield the payload in chunks and keep it once it has been sent in full."""
+        chunks = []
+        for chunk in STREAMING_FORMATS[fmt](table):
+            chunks.append(chunk)
+            yield chunk
+        with self._lock:
+            self._payloads.setdefault((key, fmt), b"".join(chunks))
+
+    def payload(self, key: Hashable, fmt: str, table: BulkTable) -> bytes:
+        with self._lock:
+            payload = self._payloads.get((key, fmt))
+        if payload is None:
+            with stage_timer("serialize"):
+                payload = BULK_FORMATS[fmt][0](table)
+            with self._lock:
+                payload = self._payloads.setdefault((key, fmt), payload)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+            self._payloads.clear()
+
+
+bulk_exports = BulkExportCache()
@@ -0,0 +1,177 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.change_tracker import ChangeTracker
+from app.core.snapshot_store import snapshot_store
+from app.core.constants import (
+    SCRAPE_CACHE_CLOSED_YEAR_TTL,
+    SCRAPE_CACHE_MAXSIZE,
+    SCRAPE_CACHE_OPEN_YEAR_TTL,
+)
+
+CacheKey = Tuple[str, Optional[str], int]
+
+_MISSING = object()
+
+
+def is_open_year(year: int) -> bool:
+    return year >= date.today().year - 1
+
+
+class ScrapeCache:
+    """Size-bounded LRU cache whose entries expire faster for years Embrapa may still revise.
+
+    Closed years whose content changed within the tracker's window are treated
+    as open, so the prefetch scheduler keeps re-checking them.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = SCRAPE_CACHE_MAXSIZE,
+        closed_year_ttl: float = SCRAPE_CACHE_CLOSED_YEAR_TTL,
+        open_year_ttl: float = SCRAPE_CACHE_OPEN_YEAR_TTL,
+        clock: Callable[[], float] = time.monotonic,
+        tracker: Optional[ChangeTracker] = None,
+    ):
+        self.maxsize = maxsize
+        self.closed_year_ttl = closed_year_ttl
+        self.open_year_ttl = open_year_ttl
+        self._clock = clock
+        self.tracker = tracker if tracker is not None else ChangeTracker()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def ttl_for(self, year: int) -> float:
+        return self.open_year_ttl if is_open_year(year) else self.closed_year_ttl
+
+    def ttl_for_key(self, key: CacheKey) -> float:
+        if self.tracker.changed_recently(key):
+            return self.open_year_ttl
+        return self.ttl_for(key[-1])
+
+    def get(self, key: CacheKey, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: CacheKey, value: Any) -> None:
+        expires_at = self._clock() + self.ttl_for_key(key)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def peek(self, key: CacheKey, default: Any = None) -> Any:
+        """Current value for ``key``, expired or not, without touching stats or LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[1] if entry is not None else default
+
+    def fresh(self, key: CacheKey, default: Any = None) -> Any:
+        """Unexpired value for ``key`` without touching stats or LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[0] <= self._clock():
+            return default
+        return entry[1]
+
+    def expires_within(self, key: CacheKey, horizon: float) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry is None or entry[0] - self._clock() <= horizon
+
+    def invalidate(self, key: CacheKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+        self.tracker.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def sync_changes(self) -> int:
+        """Drop entries whose content another worker has seen change; returns how many."""
+        stale = self.tracker.pull_changes()
+        for key in stale:
+            self.invalidate(key)
+        return len(stale)
+
+    async def _store(self, key: CacheKey, value: Any, previous: Any) -> Any:
+        # Hashing and the shared change record stay off the event loop.
+        changed = await run_in_threadpool(self.tracker.record, key, value)
+        if not changed and previous is not _MISSING:
+            # Same content: keep the old list so the result index and
+            # dataset versions, which key on identity, stay valid.
+            value = previous
+        self.set(key, value)
+        return value
+
+    def cached(self, tab: str):
+        def decorator(fn: Callable[..., Awaitable[Any]]):
+            @functools.wraps(fn)
+            async def wrapper(*args):
+                key = cache_key(tab, *args)
+                # Peek first: an expired entry is dropped by get() but can still be reused.
+                previous = self.peek(key, _MISSING)
+                value = self.get(key, _MISSING)
+                if value is not _MISSING:
+                    return value
+
+                return await self._store(key, await fn(*args), previous)
+
+            async def refresh(*args):
+                key = cache_key(tab, *args)
+                value = await fn(*args, refresh=True)
+                return await self._store(key, value, self.peek(key, _MISSING))
+
+            wrapper.refresh = refresh
+            return wrapper
+
+        return decorator
+
+
+def cache_key(tab: str, *args) -> CacheKey:
+    if len(args) == 1:
+        return (tab, None, args[0])
+    category, year = args
+    return (tab, category, year)
+
+
+scrape_cache = ScrapeCache(tracker=ChangeTracker(store=snapshot_store))
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional
+
+from app.core.constants import REFRESH_RECENT_CHANGE_WINDOW
+from app.core.snapshot_store import SnapshotStore
+
+
+def rows_digest(rows: Any) -> str:
+    payload = json.dumps(rows, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _store_key(key: Hashable) -> str:
+    return json.dumps(list(key) if isinstance(key, tuple) else key)
+
+
+class ContentState(NamedTuple):
+    digest: str
+    changed_at: Optional[float]
+    checked_at: float
+
+
+class ChangeTracker:
+    """Content hash, last change and last check time per (tab, category, year).
+
+    The first observation of a key is its baseline, not a change, so a cold
+    start does not mark every closed year as recently revised. With a
+    snapshot store, change times come from the host-wide record, so a change
+    seen by the worker that refreshes is known to every worker.
+    """
+
+    def __init__(
+        self,
+        recent_change_window: float = REFRESH_RECENT_CHANGE_WINDOW,
+        clock: Callable[[], float] = time.time,
+        store: Optional[SnapshotStore] = None,
+    ):
+        self.recent_change_window = recent_change_window
+        self._clock = clock
+        self.store = store
+        self._states: Dict[Hashable, ContentState] = {}
+        self._lock = threading.Lock()
+        self.changed = 0
+        self.unchanged = 0
+
+    def record(self, key: Hashable, rows: Any) -> bool:
+        """Store the hash of ``rows`` for ``key``; True if it differs from the previous one."""
+        digest = rows_digest(rows)
+        now = self._clock()
+        shared = self.store is not None
+        changed_at = self.store.record_content(_store_key(key), digest, now) if shared else now
+        with self._lock:
+            previous = self._states.get(key)
+            if previous is None:
+                self._states[key] = ContentState(digest, changed_at if shared else None, now)
+                return True
+            if previous.digest == digest:
+                self.unchanged += 1
+                self._states[key] = ContentState(digest, changed_at if shared else previous.changed_at, now)
+                return False
+            self.changed += 1
+            self._states[key] = ContentState(digest, changed_at, now)
+            return True
+
+    def pull_changes(self) -> List[Hashable]:
+        """Adopt recent change times from the shared store.
+
+        Returns the keys whose shared content differs from what this process
+        last saw, so their cached rows can be dropped.
+        """
+        if self.store is None:
+            return []
+
+        stale = []
+        since = self._clock() - self.recent_change_window
+        for stored_key, digest, changed_at in self.store.content_changes_since(since):
+            key = tuple(json.loads(stored_key))
+            with self._lock:
+                state = self._states.get(key)
+                if state is None or state.changed_at == changed_at:
+                    continue
+                self._states[key] = state._replace(changed_at=changed_at)
+            if state.digest != digest:
+                stale.append(key)
+        return stale
+
+    def get(self, key: Hashable) -> Optional[ContentState]:
+        with self._lock:
+            return self._states.get(key)
+
+    def changed_recently(self, key: Hashable) -> bool:
+        state = self.get(key)
+        return state is not None and state.changed_at is not None and (
+            self._clock() - state.changed_at <= self.recent_change_window
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self.changed = self.unchanged = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            recent = sum(
+                1 for state in self._states.values()
+                if state.changed_at is not None and self._clock() - state.changed_at <= self.recent_change_window
+            )
+            return {
+                "tracked": len(self._states),
+                "changed": self.changed,
+                "unchanged": self.unchanged,
+                "recently_changed": recent,
+            }
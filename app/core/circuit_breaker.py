@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from app.core.constants import CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Fails fast after consecutive upstream errors and lets one probe through after a cool-down."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self.rejected_calls = 0
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"Circuit '{self.name}' half-open, probing upstream.")
+
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+
+            self.rejected_calls += 1
+            raise CircuitOpenError(f"Circuit '{self.name}' is {self.state}")
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit '{self.name}' closed, upstream recovered.")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                    logger.warning(
+                        f"Circuit '{self.name}' opened after {self.consecutive_failures} consecutive failures."
+                    )
+                self.state = OPEN
+                self.opened_at = self._clock()
+                self._probe_in_flight = False
+
+    def release(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(self.reset_timeout - (self._clock() - self.opened_at), 0.0)
+            return {
+                "name": self.name,
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                "retry_in": retry_in,
+                "times_opened": self.times_opened,
+                "rejected_calls": self.rejected_calls,
+            }
+
+
+upstream_breaker = CircuitBreaker("embrapa")
@@ -0,0 +1,225 @@
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.constants import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_CACHE_MAXSIZE,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_MIN_SIZE,
+)
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def supported_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header, preferring br on ties."""
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in supported_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def compress(data: bytes, encoding: str, gzip_level: int = COMPRESSION_GZIP_LEVEL,
+             brotli_quality: int = COMPRESSION_BROTLI_QUALITY) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=brotli_quality)
+    compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    return compressor.compress(data) + compressor.flush()
+
+
+class CompressedPayloadCache:
+    """Compressed bodies keyed by (path, ETag, encoding, length).
+
+    Routes put a content hash plus the query variant in their ETag, so a
+    matching key means the uncompressed body is the same and the stored
+    bytes can be sent as is.
+    """
+
+    def __init__(self, maxsize: int = COMPRESSION_CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def set(self, key: Hashable, payload: bytes) -> None:
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+compressed_payloads = CompressedPayloadCache()
+
+
+class CompressionMiddleware:
+    """gzip/brotli response compression with a size threshold.
+
+    Whole bodies at or above ``minimum_size`` are compressed (or served from
+    ``compressed_payloads`` when they carry an ETag); streamed bodies are
+    compressed chunk by chunk and flushed so NDJSON rows still arrive as
+    they are produced.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+        cache: CompressedPayloadCache = compressed_payloads,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, scope, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send: Send):
+        self.middleware = middleware
+        self.path = scope.get("path", "")
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+
+    def _should_compress(self, headers: MutableHeaders) -> bool:
+        if self.start_message["status"] < 200 or self.start_message["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        if self.compressor is not None:
+            data = self.compressor.chunk(message.get("body", b""))
+            if not message.get("more_body", False):
+                data += self.compressor.finish()
+            await self._send({"type": "http.response.body", "body": data, "more_body": message.get("more_body", False)})
+            return
+
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self._should_compress(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+            self.passthrough = True
+            await self._send(self.start_message)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body:
+            del headers["Content-Length"]
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            await self._send(self.start_message)
+            await self._send({"type": "http.response.body", "body": self.compressor.chunk(body), "more_body": True})
+            return
+
+        etag = headers.get("etag")
+        key = (self.path, etag, self.encoding, len(body))
+        payload = self.middleware.cache.get(key) if etag else None
+        if payload is None:
+            payload = compress(body, self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            if etag:
+                self.middleware.cache.set(key, payload)
+
+        headers["Content-Length"] = str(len(payload))
+        await self._send(self.start_message)
+        await self._send({"type": "http.response.body", "body": payload})
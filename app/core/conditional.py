@@ -0,0 +1,151 @@
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import CacheKey, is_open_year, scrape_cache
+from app.core.change_tracker import rows_digest
+from app.core.constants import HTTP_CACHE_CLOSED_YEAR_MAX_AGE, HTTP_CACHE_OPEN_YEAR_MAX_AGE
+from app.core.snapshot_store import SnapshotStore, snapshot_store
+
+
+class DatasetVersion(NamedTuple):
+    digest: str
+    last_modified: int
+
+
+class DatasetVersions:
+    """Content hash and last-change time per dataset key.
+
+    The hash is recomputed only when the source object for a key is replaced,
+    and the timestamp only moves when the hash actually changes. With a
+    snapshot store, the timestamp is shared by every worker on the host and
+    survives restarts, so ``If-Modified-Since`` works behind a load balancer.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time, store: Optional[SnapshotStore] = None):
+        self._clock = clock
+        self._store = store
+        # key -> (source, version, origin)
+        self._versions: Dict[Hashable, Tuple[Any, DatasetVersion, Any]] = {}
+        self._lock = threading.Lock()
+
+    async def observe(
+        self,
+        key: Hashable,
+        source: Any,
+        digest: Callable[[Any], str] = rows_digest,
+        origin: Any = None,
+    ) -> DatasetVersion:
+        """Version of ``source``; ``origin`` is the raw object it was derived from, for ``current``."""
+        with self._lock:
+            entry = self._versions.get(key)
+        if entry is not None and entry[0] is source:
+            if origin is not None and entry[2] is not origin:
+                with self._lock:
+                    self._versions[key] = (source, entry[1], origin)
+            return entry[1]
+
+        # Hashing and the shared change-time lookup run off the event loop and
+        # outside the lock; the lock only guards the in-memory table.
+        new_digest = await run_in_threadpool(digest, source)
+
+        with self._lock:
+            entry = self._versions.get(key)
+        if entry is not None and entry[1].digest == new_digest:
+            version = entry[1]
+        else:
+            version = DatasetVersion(new_digest, await self._changed_at(key, new_digest))
+
+        with self._lock:
+            self._versions[key] = (source, version, origin)
+        return version
+
+    async def _changed_at(self, key: Hashable, digest: str) -> int:
+        now = self._clock()
+        if self._store is None:
+            return int(now)
+        return int(await run_in_threadpool(self._store.changed_at, json.dumps(key, default=str), digest, now))
+
+    def get(self, key: Hashable) -> Optional[DatasetVersion]:
+        with self._lock:
+            entry = self._versions.get(key)
+        return entry[1] if entry is not None else None
+
+    def current(self, key: Hashable, origin: Any) -> Optional[DatasetVersion]:
+        """The stored version, if it was derived from exactly ``origin``."""
+        with self._lock:
+            entry = self._versions.get(key)
+        if entry is None or origin is None or entry[2] is not origin:
+            return None
+        return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+
+
+def make_etag(version: DatasetVersion, query: str = "") -> str:
+    if not query:
+        return f'W/"{version.digest}"'
+    variant = hashlib.blake2b(query.encode("utf-8"), digest_size=4).hexdigest()
+    return f'W/"{version.digest}-{variant}"'
+
+
+def cache_control_for(year: int) -> str:
+    if is_open_year(year):
+        return f"public, max-age={HTTP_CACHE_OPEN_YEAR_MAX_AGE}"
+    return f"public, max-age={HTTP_CACHE_CLOSED_YEAR_MAX_AGE}"
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: int) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [_strip_weak(tag) for tag in if_none_match.split(",")]
+        return "*" in tags or _strip_weak(etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    return last_modified <= since
+
+
+def check_not_modified(request: Request, response: Response, version: DatasetVersion, year: int) -> Optional[Response]:
+    """Set validators on ``response``; return a 304 response when the client copy is current."""
+    etag = make_etag(version, request.url.query)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(version.last_modified, usegmt=True),
+        "Cache-Control": cache_control_for(year),
+    }
+    if is_not_modified(request, etag, version.last_modified):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
+dataset_versions = DatasetVersions(store=snapshot_store)
+
+
+def check_cached_not_modified(request: Request, response: Response, key: CacheKey) -> Optional[Response]:
+    """304 before any fetching or formatting, when the scrape cache still holds
+    the rows the stored version was computed from."""
+    version = dataset_versions.current(key, scrape_cache.fresh(key))
+    if version is None:
+        return None
+    return check_not_modified(request, response, version, key[-1])
@@ -14,11 +14,13 @@ IMPORT_END_YEAR = 2024
 EXPORT_START_YEAR = 1970
 EXPORT_END_YEAR = 2024
 
-PRODUCTION_BASE_URL = "http://vitibrasil.cnpuv.embrapa.br/index.php?ano={year}&opcao=opt_02"
-PROCESSING_BASE_URL = "http://vitibrasil.cnpuv.embrapa.br/index.php?ano={year}&opcao=opt_03&subopcao={suboption}"
-COMMERCIALIZATION_BASE_URL = "http://vitibrasil.cnpuv.embrapa.br/index.php?ano={year}&opcao=opt_04"
-IMPORT_BASE_URL = "http://vitibrasil.cnpuv.embrapa.br/index.php?ano={year}&opcao=opt_05&subopcao={suboption}"
-EXPORT_BASE_URL = "http://vitibrasil.cnpuv.embrapa.br/index.php?ano={year}&opcao=opt_06&subopcao={suboption}"
+EMBRAPA_BASE_URL = os.getenv("EMBRAPA_BASE_URL", "http://vitibrasil.cnpuv.embrapa.br").rstrip("/")
+
+PRODUCTION_BASE_URL = EMBRAPA_BASE_URL + "/index.php?ano={year}&opcao=opt_02"
+PROCESSING_BASE_URL = EMBRAPA_BASE_URL + "/index.php?ano={year}&opcao=opt_03&subopcao={suboption}"
+COMMERCIALIZATION_BASE_URL = EMBRAPA_BASE_URL + "/index.php?ano={year}&opcao=opt_04"
+IMPORT_BASE_URL = EMBRAPA_BASE_URL + "/index.php?ano={year}&opcao=opt_05&subopcao={suboption}"
+EXPORT_BASE_URL = EMBRAPA_BASE_URL + "/index.php?ano={year}&opcao=opt_06&subopcao={suboption}"
 
 PRODUCTION_CSV_COLUMNS = ["produto"]
 PROCESSING_CSV_COLUMNS = ["cultivar"]
@@ -46,4 +48,51 @@ EXPORT_CATEGORY_MAP = {
     "suco_uva": {"suboption": "subopt_04", "data_path": "export_suco_uva.csv", "name": "Suco de uva"},
 }
 PRODUCTION_CSV_PATH = "production.csv"
-COMMERCIALIZATION_CSV_PATH = "commercialization.csv"
\ No newline at end of file
+COMMERCIALIZATION_CSV_PATH = "commercialization.csv"
+SCRAPE_MAX_IN_FLIGHT = int(os.getenv("SCRAPE_MAX_IN_FLIGHT", "16"))
+SCRAPE_PER_HOST_LIMIT = int(os.getenv("SCRAPE_PER_HOST_LIMIT", "8"))
+
+SCRAPE_CACHE_MAXSIZE = int(os.getenv("SCRAPE_CACHE_MAXSIZE", "2048"))
+SCRAPE_CACHE_CLOSED_YEAR_TTL = float(os.getenv("SCRAPE_CACHE_CLOSED_YEAR_TTL", str(7 * 24 * 60 * 60)))
+SCRAPE_CACHE_OPEN_YEAR_TTL = float(os.getenv("SCRAPE_CACHE_OPEN_YEAR_TTL", str(60 * 60)))
+
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(BASE_DIR), ".cache"))
+SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", "true").lower() == "true"
+SNAPSHOT_DB_PATH = os.getenv("SNAPSHOT_DB_PATH", os.path.join(CACHE_DIR, "snapshots.sqlite3"))
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.3"))
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"
+PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL", str(15 * 60)))
+PREFETCH_JITTER = float(os.getenv("PREFETCH_JITTER", "60"))
+PREFETCH_MAX_IN_FLIGHT = int(os.getenv("PREFETCH_MAX_IN_FLIGHT", "4"))
+REFRESH_RECENT_CHANGE_WINDOW = float(os.getenv("REFRESH_RECENT_CHANGE_WINDOW", str(30 * 24 * 60 * 60)))
+
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "fast")
+
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+RESULT_INDEX_MAXSIZE = int(os.getenv("RESULT_INDEX_MAXSIZE", "4096"))
+
+HTTP_CACHE_CLOSED_YEAR_MAX_AGE = int(os.getenv("HTTP_CACHE_CLOSED_YEAR_MAX_AGE", str(24 * 60 * 60)))
+HTTP_CACHE_OPEN_YEAR_MAX_AGE = int(os.getenv("HTTP_CACHE_OPEN_YEAR_MAX_AGE", "60"))
+
+FAST_JSON_ENABLED = os.getenv("FAST_JSON_ENABLED", "false").lower() == "true"
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_CACHE_MAXSIZE = int(os.getenv("COMPRESSION_CACHE_MAXSIZE", "512"))
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL = float(os.getenv("PROFILING_INTERVAL", "0.005"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", os.path.join(CACHE_DIR, "profiles"))
+
+BINARY_DATASET_PATH = os.getenv("BINARY_DATASET_PATH", os.path.join(DATA_DIR, "vitibrasil.bin"))
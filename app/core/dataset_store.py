@@ -0,0 +1,85 @@
+import csv
+import os
+import threading
+from typing import Dict, List
+
+from app.core.constants import (
+    COMMERCIALIZATION_CSV_PATH,
+    DATA_DIR,
+    EXPORT_CATEGORY_MAP,
+    IMPORT_CATEGORY_MAP,
+    PROCESSING_CATEGORY_MAP,
+    PRODUCTION_CSV_PATH,
+)
+
+
+class CsvDataset:
+    """Column-major view of one tab-separated fallback file, parsed once."""
+
+    def __init__(self, header: List[str], columns: List[List[str]]):
+        self.header = header
+        self.columns = columns
+        self.row_count = len(columns[0]) if columns else 0
+        self.header_index: Dict[str, List[int]] = {}
+        self.row_cache: Dict[tuple, List[Dict[str, str]]] = {}
+        for i, col in enumerate(header):
+            self.header_index.setdefault(col, []).append(i)
+
+    def column_indices(self, name: str) -> List[int]:
+        return self.header_index.get(name, [])
+
+    def year_columns(self, year: int) -> List[List[str]]:
+        return [self.columns[i] for i in self.column_indices(str(year))]
+
+
+_datasets: Dict[str, CsvDataset] = {}
+_lock = threading.Lock()
+
+
+def parse_csv_dataset(full_csv_path: str) -> CsvDataset:
+    with open(full_csv_path, newline="", encoding="utf-8") as csvfile:
+        reader = csv.reader(csvfile, delimiter="\t")
+        header = next(reader)
+        columns: List[List[str]] = [[] for _ in header]
+
+        for row in reader:
+            for i, column in enumerate(columns):
+                column.append(row[i].strip() if i < len(row) else "")
+
+    return CsvDataset(header, columns)
+
+
+def get_csv_dataset(csv_path: str) -> CsvDataset:
+    dataset = _datasets.get(csv_path)
+    if dataset is not None:
+        return dataset
+
+    with _lock:
+        dataset = _datasets.get(csv_path)
+        if dataset is None:
+            dataset = parse_csv_dataset(os.path.join(DATA_DIR, csv_path))
+            _datasets[csv_path] = dataset
+
+    return dataset
+
+
+def register_csv_dataset(csv_path: str, dataset: CsvDataset) -> None:
+    with _lock:
+        _datasets[csv_path] = dataset
+
+
+def fallback_csv_paths() -> List[str]:
+    paths = [PRODUCTION_CSV_PATH, COMMERCIALIZATION_CSV_PATH]
+    for category_map in (PROCESSING_CATEGORY_MAP, IMPORT_CATEGORY_MAP, EXPORT_CATEGORY_MAP):
+        paths.extend(config["data_path"] for config in category_map.values())
+    return paths
+
+
+def preload_csv_datasets() -> None:
+    for csv_path in fallback_csv_paths():
+        get_csv_dataset(csv_path)
+
+
+def clear_csv_datasets() -> None:
+    with _lock:
+        _datasets.clear()
@@ -0,0 +1,67 @@
+import asyncio
+import weakref
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Tuple, TypeVar, Union
+from urllib.parse import urlparse
+
+from app.core.constants import SCRAPE_MAX_IN_FLIGHT, SCRAPE_PER_HOST_LIMIT
+
+Job = TypeVar("Job")
+Result = TypeVar("Result")
+
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def host_semaphore(url: str, limit: int = SCRAPE_PER_HOST_LIMIT) -> asyncio.Semaphore:
+    semaphores = _host_semaphores.setdefault(asyncio.get_running_loop(), {})
+    host = urlparse(url).netloc
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(limit)
+    return semaphores[host]
+
+
+async def fan_out(
+    jobs: Iterable[Job],
+    fetch_fn: Callable[[Job], Awaitable[Result]],
+    max_in_flight: int = SCRAPE_MAX_IN_FLIGHT,
+) -> List[Union[Result, BaseException]]:
+    semaphore = asyncio.Semaphore(max_in_flight)
+
+    async def run(job: Job) -> Result:
+        async with semaphore:
+            return await fetch_fn(job)
+
+    return await asyncio.gather(*(run(job) for job in jobs), return_exceptions=True)
+
+
+async def iter_fan_out(
+    jobs: Iterable[Job],
+    fetch_fn: Callable[[Job], Awaitable[Result]],
+    max_in_flight: int = SCRAPE_MAX_IN_FLIGHT,
+) -> AsyncIterator[Tuple[Job, Union[Result, BaseException]]]:
+    job_iter = iter(jobs)
+    pending: Deque[Tuple[Job, asyncio.Future]] = deque()
+
+    def schedule() -> None:
+        while len(pending) < max_in_flight:
+            try:
+                job = next(job_iter)
+            except StopIteration:
+                return
+            pending.append((job, asyncio.ensure_future(fetch_fn(job))))
+
+    try:
+        schedule()
+        while pending:
+            job, task = pending.popleft()
+            try:
+                result = await task
+            except Exception as e:
+                result = e
+            schedule()
+            yield job, result
+    finally:
+        for _, task in pending:
+            task.cancel()
@@ -0,0 +1,134 @@
+import logging
+from html.parser import HTMLParser
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+
+from app.core.constants import HTML_PARSER_BACKEND
+
+logger = logging.getLogger(__name__)
+
+TABLE_CLASS = "tb_base tb_dados"
+
+
+class Cell:
+    """Minimal stand-in for a BeautifulSoup ``td`` tag, exposing only ``get_text``."""
+
+    __slots__ = ("strings",)
+
+    def __init__(self):
+        self.strings: List[str] = []
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        if strip:
+            return separator.join(text for text in (s.strip() for s in self.strings) if text)
+        return separator.join(self.strings)
+
+
+class _TableFound(Exception):
+    pass
+
+
+class _TableRowExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found = False
+        self.rows: List[List[Cell]] = []
+        self._in_tbody = False
+        self._row: Optional[List[Cell]] = None
+        self._cell: Optional[Cell] = None
+        self._text: List[str] = []
+
+    def _flush_text(self) -> None:
+        if self._text:
+            if self._cell is not None:
+                self._cell.strings.append("".join(self._text))
+            self._text = []
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if not self.found:
+            if tag == "table" and " ".join((dict(attrs).get("class") or "").split()) == TABLE_CLASS:
+                self.found = True
+            return
+
+        if tag == "tbody":
+            self._in_tbody = True
+        elif not self._in_tbody:
+            return
+        elif tag == "tr":
+            self._row = []
+            self.rows.append(self._row)
+        elif tag == "td" and self._row is not None:
+            self._cell = Cell()
+            self._row.append(self._cell)
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if not self._in_tbody:
+            if self.found and tag == "table":
+                raise _TableFound()
+            return
+
+        if tag == "td":
+            self._cell = None
+        elif tag == "tr":
+            self._row = None
+            self._cell = None
+        elif tag == "tbody":
+            raise _TableFound()
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._text.append(data)
+
+
+def _extract(html: str) -> _TableRowExtractor:
+    extractor = _TableRowExtractor()
+    try:
+        extractor.feed(html)
+        extractor.close()
+    except _TableFound:
+        pass
+    return extractor
+
+
+def extract_rows_fast(html: str) -> List[List[Cell]]:
+    marker = html.find("tb_dados")
+    if marker == -1:
+        raise ValueError("Data table not found")
+
+    extractor = _extract(html[max(html.rfind("<table", 0, marker), 0):])
+    if not extractor.found:
+        extractor = _extract(html)
+    if not extractor.found:
+        raise ValueError("Data table not found")
+    if not extractor._in_tbody:
+        raise AttributeError("Data table has no tbody")
+
+    return extractor.rows
+
+
+def extract_rows_bs4(html: str) -> list:
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", class_=TABLE_CLASS)
+    if not table:
+        raise ValueError("Data table not found")
+
+    return [tr.find_all("td") for tr in table.find("tbody").find_all("tr")]
+
+
+def extract_table_rows(html: str, backend: str = HTML_PARSER_BACKEND) -> list:
+    if backend == "bs4":
+        return extract_rows_bs4(html)
+
+    try:
+        return extract_rows_fast(html)
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.warning(f"Fast table extraction failed, falling back to BeautifulSoup: {e}")
+        return extract_rows_bs4(html)
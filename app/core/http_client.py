@@ -0,0 +1,47 @@
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.core.constants import HTTP_BACKOFF_FACTOR, HTTP_MAX_RETRIES, HTTP_POOL_SIZE
+
+_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+
+def create_session(
+    pool_size: int = HTTP_POOL_SIZE,
+    max_retries: int = HTTP_MAX_RETRIES,
+    backoff_factor: float = HTTP_BACKOFF_FACTOR,
+) -> requests.Session:
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def close_session() -> None:
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
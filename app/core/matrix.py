@@ -0,0 +1,158 @@
+from typing import Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+from app.core.binary_dataset import BinaryTable
+from app.core.dataset_store import CsvDataset, get_csv_dataset
+from app.core.utils import parse_amount
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+class TabMatrix:
+    """Year x item integer matrices for one tab/category.
+
+    ``amount`` (and ``value`` for import/export) have shape ``(items, years)``;
+    rows line up with ``labels`` and ``groups``, columns with ``years``.
+    Non-numeric cells (``-``, ``*``, ``nd``, blanks) are stored as 0 and decimal commas
+    are truncated, as in ``utils.parse_amount``.
+    """
+
+    def __init__(
+        self,
+        labels: List[str],
+        groups: List[str],
+        is_group: List[bool],
+        years: List[int],
+        amount,
+        value=None,
+    ):
+        self.labels = np.array(labels, dtype=object)
+        self.groups = np.array(groups, dtype=object)
+        self.is_group = np.array(is_group, dtype=bool)
+        self.years = np.array(years, dtype=np.int64)
+        self.amount = amount
+        self.value = value
+        self._year_positions: Dict[int, int] = {year: i for i, year in enumerate(years)}
+
+    @property
+    def nbytes(self) -> int:
+        total = self.amount.nbytes + self.years.nbytes + self.is_group.nbytes
+        return total + (self.value.nbytes if self.value is not None else 0)
+
+    def year_position(self, year: int) -> Optional[int]:
+        return self._year_positions.get(year)
+
+    def year_range(self, start: int, end: int) -> slice:
+        positions = np.flatnonzero((self.years >= start) & (self.years <= end))
+        if not len(positions):
+            return slice(0, 0)
+        return slice(int(positions[0]), int(positions[-1]) + 1)
+
+    def slice_year(self, year: int) -> dict:
+        position = self.year_position(year)
+        if position is None:
+            raise KeyError(year)
+        result = {"amount": self.amount[:, position]}
+        if self.value is not None:
+            result["value"] = self.value[:, position]
+        return result
+
+    def totals(self, start: Optional[int] = None, end: Optional[int] = None) -> dict:
+        columns = self.year_range(
+            self.years[0] if start is None else start,
+            self.years[-1] if end is None else end,
+        )
+        result = {"amount": self.amount[:, columns].sum(axis=1)}
+        if self.value is not None:
+            result["value"] = self.value[:, columns].sum(axis=1)
+        return result
+
+
+def _group_columns(labels: List[str]):
+    groups = []
+    is_group = []
+    current_group = ""
+    for label in labels:
+        header_row = label.isupper()
+        if header_row:
+            current_group = label
+        groups.append(current_group)
+        is_group.append(header_row)
+    return groups, is_group
+
+
+def _mapped_matrix(table: BinaryTable, values):
+    # Zero-copy: a read-only (items, years) view over the year-major int64 columns.
+    return np.frombuffer(values, dtype="<i8").reshape(len(table.years), table.row_count).T
+
+
+def build_binary_matrix(table: BinaryTable) -> TabMatrix:
+    groups, is_group = _group_columns(table.labels)
+    return TabMatrix(
+        labels=table.labels,
+        groups=groups,
+        is_group=is_group,
+        years=table.years,
+        amount=_mapped_matrix(table, table.amount),
+        value=_mapped_matrix(table, table.value) if table.value is not None else None,
+    )
+
+
+def build_matrix(dataset: CsvDataset, label_column: str) -> TabMatrix:
+    if np is None:
+        raise ImportError("numpy is required for matrix datasets; install it with 'pip install numpy'")
+
+    if isinstance(dataset, BinaryTable):
+        return build_binary_matrix(dataset)
+
+    labels = dataset.columns[dataset.column_indices(label_column)[-1]]
+
+    years = []
+    amount_columns = []
+    value_columns = []
+    for col in dict.fromkeys(dataset.header):
+        if not col.isdigit():
+            continue
+        indices = dataset.column_indices(col)
+        years.append(int(col))
+        amount_columns.append(indices[0])
+        if len(indices) > 1:
+            value_columns.append(indices[1])
+
+    def to_matrix(indices: List[int]):
+        matrix = np.zeros((dataset.row_count, len(indices)), dtype=np.int64)
+        for j, i in enumerate(indices):
+            matrix[:, j] = [parse_amount(value) for value in dataset.columns[i]]
+        return matrix
+
+    groups, is_group = _group_columns(labels)
+
+    return TabMatrix(
+        labels=list(labels),
+        groups=groups,
+        is_group=is_group,
+        years=years,
+        amount=to_matrix(amount_columns),
+        value=to_matrix(value_columns) if value_columns else None,
+    )
+
+
+_matrices: Dict[str, TabMatrix] = {}
+
+
+def get_csv_matrix(csv_path: str, label_column: str) -> TabMatrix:
+    matrix = _matrices.get(csv_path)
+    if matrix is None:
+        matrix = build_matrix(get_csv_dataset(csv_path), label_column)
+        _matrices[csv_path] = matrix
+    return matrix
+
+
+def clear_csv_matrices() -> None:
+    _matrices.clear()
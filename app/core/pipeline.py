@@ -0,0 +1,42 @@
+import json
+from typing import Any, AsyncIterator, List, Tuple
+
+from fastapi.responses import StreamingResponse
+
+
+async def paginate(rows: AsyncIterator[Any], offset: int, limit: int) -> AsyncIterator[Any]:
+    seen = 0
+    try:
+        async for row in rows:
+            if seen >= offset:
+                yield row
+            seen += 1
+            if seen >= offset + limit:
+                break
+    finally:
+        await rows.aclose()
+
+
+async def take_page(rows: AsyncIterator[Any], offset: int, limit: int) -> Tuple[List[Any], int]:
+    page = []
+    seen = 0
+    try:
+        async for row in rows:
+            if seen >= offset:
+                page.append(row)
+            seen += 1
+            if seen >= offset + limit:
+                break
+    finally:
+        await rows.aclose()
+
+    return page, seen
+
+
+async def _ndjson_lines(rows: AsyncIterator[Any]) -> AsyncIterator[str]:
+    async for row in rows:
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def ndjson_response(rows: AsyncIterator[Any]) -> StreamingResponse:
+    return StreamingResponse(_ndjson_lines(rows), media_type="application/x-ndjson")
@@ -0,0 +1,150 @@
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.constants import (
+    PROFILING_DIR,
+    PROFILING_INTERVAL,
+    PROFILING_SAMPLE_RATE,
+    PROFILING_TOKEN,
+)
+
+logger = logging.getLogger(__name__)
+
+# Leaf frames of threads that are parked (event loop select, idle threadpool workers).
+IDLE_FRAMES = {("selectors.py", "select"), ("threading.py", "wait")}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples every other thread's Python stack at a fixed interval.
+
+    Stacks are aggregated in collapsed ("folded") form, one line per unique
+    stack with its sample count, which flamegraph.pl, speedscope and similar
+    tools read directly.
+    """
+
+    def __init__(self, interval: float = PROFILING_INTERVAL):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class ProfilingMiddleware:
+    """Profiles single requests with a sampling profiler.
+
+    A request carrying ``X-Profile-Token: <token>`` gets the collapsed profile
+    back instead of its normal body; otherwise a ``sample_rate`` fraction of
+    requests is profiled and written to ``output_dir``. Only one request is
+    profiled at a time.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: str = PROFILING_TOKEN,
+        sample_rate: float = PROFILING_SAMPLE_RATE,
+        interval: float = PROFILING_INTERVAL,
+        output_dir: str = PROFILING_DIR,
+    ):
+        self.app = app
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.output_dir = output_dir
+        self._busy = threading.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = bool(self.token) and Headers(scope=scope).get("x-profile-token") == self.token
+        sampled = not requested and self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (requested or sampled) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = StackSampler(self.interval)
+        status = 500
+
+        async def capture(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, capture if requested else send)
+        finally:
+            sampler.stop()
+            self._busy.release()
+        elapsed = time.perf_counter() - start
+
+        if requested:
+            response = PlainTextResponse(sampler.collapsed(), headers={
+                "X-Profiled-Status": str(status),
+                "X-Profile-Samples": str(sampler.samples),
+                "X-Profile-Duration": f"{elapsed:.6f}",
+            })
+            await response(scope, receive, send)
+            return
+
+        await run_in_threadpool(self._store, scope["path"], sampler.collapsed())
+
+    def _store(self, path: str, profile: str) -> None:
+        slug = path.strip("/").replace("/", "_") or "root"
+        filename = os.path.join(self.output_dir, f"{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 10**6:06d}-{slug}.folded")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(filename, "w", encoding="utf-8") as f:
+                f.write(profile)
+        except OSError as e:
+            logger.warning(f"Could not store profile for {path}: {e}")
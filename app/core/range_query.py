@@ -0,0 +1,91 @@
+import hashlib
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.core.matrix import TabMatrix, get_csv_matrix, np
+
+
+def load_range_matrix(csv_path: str, label_column: str) -> TabMatrix:
+    try:
+        return get_csv_matrix(csv_path, label_column)
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+
+def summarize_range(
+    matrix: TabMatrix,
+    start: int,
+    end: int,
+    label_key: str,
+    totals: bool = False,
+    deltas: bool = False,
+    top: Optional[int] = None,
+) -> dict:
+    """Per-item yearly series for ``start..end`` computed on the matrix columns.
+
+    Group header rows and items with no data in the range are dropped.
+    ``top`` keeps the N items with the largest total amount over the range;
+    deltas are year-over-year changes, with ``None`` when the previous year
+    is not in the dataset.
+    """
+    columns = matrix.year_range(start, end)
+    metrics = {"amount": matrix.amount}
+    if matrix.value is not None:
+        metrics["value"] = matrix.value
+    windows = {name: values[:, columns] for name, values in metrics.items()}
+
+    active = np.zeros(len(matrix.labels), dtype=bool)
+    for window in windows.values():
+        active |= window.any(axis=1)
+    rows = np.flatnonzero(active & ~matrix.is_group)
+
+    sums = {name: window.sum(axis=1) for name, window in windows.items()}
+    if top is not None:
+        order = np.argsort(-sums["amount"][rows], kind="stable")[:top]
+        rows = rows[order]
+
+    changes = {}
+    if deltas:
+        for name, window in windows.items():
+            previous = np.empty_like(window)
+            previous[:, 1:] = window[:, :-1]
+            if columns.start > 0:
+                previous[:, 0] = metrics[name][:, columns.start - 1]
+            changes[name] = window - previous
+
+    items = []
+    for i in rows.tolist():
+        item = {label_key: matrix.labels[i]}
+        if matrix.groups[i]:
+            item["type"] = matrix.groups[i]
+
+        for name, window in windows.items():
+            item[name] = window[i].tolist()
+        if totals:
+            for name in windows:
+                item[f"total_{name}"] = int(sums[name][i])
+        for name, change in changes.items():
+            change = change[i].tolist()
+            if columns.start == 0:
+                change[0] = None
+            item[f"{name}_change"] = change
+
+        items.append(item)
+
+    return {
+        "start": start,
+        "end": end,
+        "years": matrix.years[columns].tolist(),
+        "items": items,
+    }
+
+
+def matrix_digest(matrix: TabMatrix) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\0".join(matrix.labels.tolist()).encode("utf-8"))
+    digest.update(matrix.years.tobytes())
+    digest.update(matrix.amount.tobytes())
+    if matrix.value is not None:
+        digest.update(matrix.value.tobytes())
+    return digest.hexdigest()
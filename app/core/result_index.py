@@ -0,0 +1,57 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+from app.core.constants import RESULT_INDEX_MAXSIZE
+from app.core.metrics import stage_timer
+
+
+class ResultIndex:
+    """Formatted, integer-typed rows (or an index over them) per (tab, category, year, variant).
+
+    An entry is rebuilt only when the raw rows it was built from are replaced,
+    which the scrape cache and the CSV store signal by handing out a new list.
+    """
+
+    def __init__(self, maxsize: int = RESULT_INDEX_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[list, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, key: Hashable, source: list, build: Callable[[list], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is source:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        with stage_timer("format"):
+            rows = build(source)
+
+        with self._lock:
+            self.builds += 1
+            self._entries[key] = (source, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return rows
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.builds = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "maxsize": self.maxsize, "hits": self.hits, "builds": self.builds}
+
+
+result_index = ResultIndex()
@@ -0,0 +1,69 @@
+import heapq
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence
+
+
+class RowIndex:
+    """Formatted rows of one (tab, category, year) with label and type lookups.
+
+    Labels (country, product or cultivar) and type groups are matched
+    case-insensitively.
+    """
+
+    def __init__(self, rows: List[dict], label_key: str):
+        self.rows = rows
+        self.label_key = label_key
+        self.by_label: Dict[str, List[int]] = {}
+        self.by_type: Dict[str, List[int]] = {}
+        for i, row in enumerate(rows):
+            self.by_label.setdefault(row[label_key].casefold(), []).append(i)
+            if "type" in row:
+                self.by_type.setdefault(row["type"].casefold(), []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def select(
+        self,
+        labels: Optional[Sequence[str]] = None,
+        types: Optional[Sequence[str]] = None,
+    ) -> List[dict]:
+        if not labels and not types:
+            return self.rows
+
+        positions = None
+        for lookup, values in ((self.by_label, labels), (self.by_type, types)):
+            if not values:
+                continue
+            matched = {i for value in values for i in lookup.get(value.casefold(), ())}
+            positions = matched if positions is None else positions & matched
+
+        return [self.rows[i] for i in sorted(positions)]
+
+
+def sort_rows(
+    rows: List[dict],
+    sort_by: str,
+    descending: bool = True,
+    top: Optional[int] = None,
+) -> List[dict]:
+    key = itemgetter(sort_by)
+    if top is None:
+        return sorted(rows, key=key, reverse=descending)
+    if descending:
+        return heapq.nlargest(top, rows, key=key)
+    return heapq.nsmallest(top, rows, key=key)
+
+
+def query_rows(
+    index: RowIndex,
+    labels: Optional[Sequence[str]] = None,
+    types: Optional[Sequence[str]] = None,
+    sort_by: Optional[str] = None,
+    order: str = "desc",
+    top: Optional[int] = None,
+) -> List[dict]:
+    rows = index.select(labels, types)
+    if sort_by is None and top is None:
+        return rows
+    return sort_rows(rows, sort_by or "amount", descending=order == "desc", top=top)
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import random
+import uuid
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import CacheKey, ScrapeCache, scrape_cache
+from app.core.constants import PREFETCH_INTERVAL, PREFETCH_JITTER, PREFETCH_MAX_IN_FLIGHT
+from app.core.fanout import fan_out
+from app.core.snapshot_store import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshScheduler:
+    """Periodically re-scrapes every cache key that would expire before the next cycle.
+
+    Expiry follows the cache TTLs, so open and recently changed years are
+    re-checked every cycle or two while closed years come up about once a week.
+
+    Keys that are not cached at all are loaded through ``warm_fn``, which may
+    use a fresh snapshot instead of fetching. With a ``lease_store``, only the
+    worker holding the shared lease refreshes. The other workers drop the
+    entries it has seen change and reload them from its snapshots.
+    """
+
+    LEASE_NAME = "prefetch"
+
+    def __init__(
+        self,
+        targets_fn: Callable[[], Iterable[CacheKey]],
+        refresh_fn: Callable[[CacheKey], Awaitable[object]],
+        cache: ScrapeCache = scrape_cache,
+        interval: float = PREFETCH_INTERVAL,
+        jitter: float = PREFETCH_JITTER,
+        max_in_flight: int = PREFETCH_MAX_IN_FLIGHT,
+        warm_fn: Optional[Callable[[CacheKey], Awaitable[object]]] = None,
+        lease_store: Optional[SnapshotStore] = None,
+    ):
+        self.targets_fn = targets_fn
+        self.refresh_fn = refresh_fn
+        self.cache = cache
+        self.interval = interval
+        self.jitter = jitter
+        self.max_in_flight = max_in_flight
+        self.warm_fn = warm_fn
+        self.lease_store = lease_store
+        self.owner = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+
+    def due_targets(self) -> List[CacheKey]:
+        horizon = self.interval + self.jitter
+        return [target for target in self.targets_fn() if self.cache.expires_within(target, horizon)]
+
+    def holds_lease(self) -> bool:
+        if self.lease_store is None:
+            return True
+        ttl = 2 * (self.interval + self.jitter)
+        return self.lease_store.acquire_lease(self.LEASE_NAME, self.owner, ttl)
+
+    async def _refresh_target(self, target: CacheKey) -> object:
+        if self.warm_fn is not None and self.cache.peek(target) is None:
+            return await self.warm_fn(target)
+        return await self.refresh_fn(target)
+
+    async def refresh_once(self) -> int:
+        if not self.holds_lease():
+            stale = await run_in_threadpool(self.cache.sync_changes)
+            logger.debug(f"Prefetch cycle skipped: another worker holds the refresh lease ({stale} changed pages dropped).")
+            return 0
+
+        targets = self.due_targets()
+        changed_before = self.cache.tracker.changed
+        results = await fan_out(targets, self._refresh_target, max_in_flight=self.max_in_flight)
+
+        failures = 0
+        for target, result in zip(targets, results):
+            if isinstance(result, BaseException):
+                failures += 1
+                logger.debug(f"Prefetch failed for {target}: {result}")
+
+        changed = self.cache.tracker.changed - changed_before
+        logger.info(f"Prefetch cycle refreshed {len(targets) - failures}/{len(targets)} pages, {changed} changed.")
+        return len(targets) - failures
+
+    async def _run(self) -> None:
+        await asyncio.sleep(random.uniform(0, self.jitter))
+        while True:
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                logger.warning(f"Prefetch cycle failed: {e}")
+            await asyncio.sleep(self.interval + random.uniform(0, self.jitter))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.lease_store is not None:
+            self.lease_store.release_lease(self.LEASE_NAME, self.owner)
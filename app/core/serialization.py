@@ -0,0 +1,47 @@
+import logging
+from typing import Any, Mapping, Optional, Type
+
+from fastapi.responses import JSONResponse
+
+from app.core.constants import FAST_JSON_ENABLED
+from app.core.metrics import stage_timer
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def fast_json_available() -> bool:
+    return orjson is not None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson.
+
+    The output is byte-for-byte what JSONResponse produces for the rows the
+    routes return (compact separators, UTF-8, no ASCII escaping).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def get_response_class() -> Type[JSONResponse]:
+    if not FAST_JSON_ENABLED:
+        return JSONResponse
+    if orjson is None:
+        logger.warning("FAST_JSON_ENABLED is set but orjson is not installed; using the standard encoder.")
+        return JSONResponse
+    return FastJSONResponse
+
+
+def json_response(content: Any, headers: Optional[Mapping[str, str]] = None) -> JSONResponse:
+    """Render ``content`` directly, skipping FastAPI's ``jsonable_encoder`` pass.
+
+    Only use it for content that is already JSON-native (dicts, lists, str, int).
+    """
+    with stage_timer("serialize"):
+        return get_response_class()(content, headers=headers)
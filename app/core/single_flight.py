@@ -0,0 +1,42 @@
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers with the same key share its result."""
+
+    def __init__(self):
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        calls = self._calls.setdefault(asyncio.get_running_loop(), {})
+        task = calls.get(key)
+
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            calls[key] = task
+
+            def forget(done: asyncio.Task) -> None:
+                if calls.get(key) is done:
+                    del calls[key]
+                if not done.cancelled():
+                    done.exception()
+
+            task.add_done_callback(forget)
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        in_flight = sum(len(calls) for calls in self._calls.values())
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": in_flight}
+
+
+scrape_flights = SingleFlight()
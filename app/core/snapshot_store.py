@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from app.core.constants import SNAPSHOT_DB_PATH, SNAPSHOT_ENABLED
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """Scraped tables persisted in SQLite, keyed by URL, shared by every worker on the host."""
+
+    def __init__(self, db_path: str = SNAPSHOT_DB_PATH, enabled: bool = SNAPSHOT_ENABLED):
+        self.db_path = db_path
+        self.enabled = enabled
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                "url TEXT PRIMARY KEY, fetched_at REAL NOT NULL, rows TEXT NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS versions ("
+                "key TEXT PRIMARY KEY, digest TEXT NOT NULL, changed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS content_changes ("
+                "key TEXT PRIMARY KEY, digest TEXT NOT NULL, changed_at REAL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def load(self, url: str, max_age: float) -> Optional[List[dict]]:
+        if not self.enabled:
+            return None
+
+        try:
+            row = self._connection().execute(
+                "SELECT fetched_at, rows FROM snapshots WHERE url = ?", (url,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Snapshot read failed for url='{url}': {e}")
+            return None
+
+        if row is None:
+            return None
+
+        fetched_at, rows = row
+        if time.time() - fetched_at > max_age:
+            return None
+        return json.loads(rows)
+
+    def save(self, url: str, data: List[dict]) -> None:
+        if not self.enabled:
+            return
+
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO snapshots (url, fetched_at, rows) VALUES (?, ?, ?)",
+                    (url, time.time(), json.dumps(data, ensure_ascii=False)),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Snapshot write failed for url='{url}': {e}")
+
+    def changed_at(self, key: str, digest: str, now: float) -> float:
+        """When ``key`` last changed to ``digest``, as seen by any worker on this host."""
+        if not self.enabled:
+            return now
+
+        try:
+            connection = self._connection()
+            with connection:
+                row = connection.execute("SELECT digest, changed_at FROM versions WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[0] == digest:
+                    return row[1]
+                connection.execute(
+                    "INSERT OR REPLACE INTO versions (key, digest, changed_at) VALUES (?, ?, ?)",
+                    (key, digest, now),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Version lookup failed for key='{key}': {e}")
+
+        return now
+
+    def record_content(self, key: str, digest: str, now: float) -> Optional[float]:
+        """Store the scraped-content ``digest`` for ``key``; return when it last changed.
+
+        The first digest stored for a key is a baseline with no change time.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            connection = self._connection()
+            with connection:
+                row = connection.execute(
+                    "SELECT digest, changed_at FROM content_changes WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    connection.execute(
+                        "INSERT OR IGNORE INTO content_changes (key, digest, changed_at) VALUES (?, ?, NULL)",
+                        (key, digest),
+                    )
+                    return None
+                if row[0] == digest:
+                    return row[1]
+                connection.execute(
+                    "UPDATE content_changes SET digest = ?, changed_at = ? WHERE key = ?", (digest, now, key)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Content change record failed for key='{key}': {e}")
+            return None
+
+        return now
+
+    def content_changes_since(self, since: float) -> List[Tuple[str, str, float]]:
+        if not self.enabled:
+            return []
+
+        try:
+            return self._connection().execute(
+                "SELECT key, digest, changed_at FROM content_changes WHERE changed_at >= ?", (since,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Content change lookup failed: {e}")
+            return []
+
+    def acquire_lease(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew the named lease for ``owner``; False while another owner holds it.
+
+        Without a snapshot database there is nothing to share, so the lease is always granted.
+        """
+        if not self.enabled:
+            return True
+
+        now = time.time()
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT (name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                    "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                    (name, owner, now + ttl, now),
+                )
+                row = connection.execute("SELECT owner FROM leases WHERE name = ?", (name,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Lease '{name}' could not be acquired: {e}")
+            return False
+
+        return row is not None and row[0] == owner
+
+    def release_lease(self, name: str, owner: str) -> None:
+        if not self.enabled:
+            return
+
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+        except sqlite3.Error as e:
+            logger.warning(f"Lease '{name}' could not be released: {e}")
+
+
+snapshot_store = SnapshotStore()
@@ -1,11 +1,17 @@
-import csv
-import os
 from typing import Callable, List, Dict, Optional
-from bs4 import BeautifulSoup
 from fastapi import HTTPException
-import requests
-
-from app.core.constants import DATA_DIR
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import scrape_cache
+from app.core.circuit_breaker import upstream_breaker
+from app.core.constants import HTTP_TIMEOUT
+from app.core.dataset_store import get_csv_dataset
+from app.core.fanout import host_semaphore
+from app.core.html_table import extract_table_rows
+from app.core.http_client import get_session
+from app.core.metrics import stage_timer
+from app.core.single_flight import scrape_flights
+from app.core.snapshot_store import snapshot_store
 
 def validate_year(year: int, start_year: int, end_year: int):
     if year < start_year or year > end_year:
@@ -14,6 +20,15 @@ def validate_year(year: int, start_year: int, end_year: int):
             detail=f"Year out of range. Available range: {start_year} to {end_year}"
         )
 
+def validate_year_range(start: int, end: int, start_year: int, end_year: int):
+    validate_year(start, start_year, end_year)
+    validate_year(end, start_year, end_year)
+    if start > end:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid year range. Start year {start} is after end year {end}"
+        )
+
 def validate_category(category: str, allowed_categories: list[str]):
     if category not in allowed_categories:
         available = ", ".join(allowed_categories)
@@ -22,63 +37,89 @@ def validate_category(category: str, allowed_categories: list[str]):
             detail=f"Invalid category. Available categories: {available}"
         )
 
+def validate_sort_key(sort_by: Optional[str], allowed_keys: list[str]):
+    if sort_by is not None and sort_by not in allowed_keys:
+        available = ", ".join(allowed_keys)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort key. Available keys: {available}"
+        )
+
+def amount_or_none(value: Optional[str]) -> Optional[int]:
+    """Integer for an Embrapa cell; ``-``, ``*``, ``nd`` and blanks are None.
+
+    Thousands separators are dropped and decimal commas truncated.
+    """
+    if value is None:
+        return None
+    value = value.strip().replace(".", "")
+    if "," in value:
+        value = value.split(",", 1)[0]
+    return int(value) if value.isdigit() else None
+
+
+def parse_amount(value: Optional[str]) -> int:
+    amount = amount_or_none(value)
+    return amount if amount is not None else 0
+
 def load_from_csv(
     csv_path: str,
     year: int,
     columns: List[str],
 ) -> List[Dict[str, str]]:
+    dataset = get_csv_dataset(csv_path)
+    cache_key = (year, tuple(columns))
+    cached = dataset.row_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     year_str = str(year)
     result = []
 
+    fixed_col_indices = sorted(
+        (dataset.column_indices(col)[-1], col)
+        for col in columns
+        if dataset.column_indices(col)
+    )
+    fixed_columns = {col: dataset.columns[i] for i, col in fixed_col_indices}
+    year_columns = dataset.year_columns(year)
 
-    full_csv_path = os.path.join(DATA_DIR, csv_path)
-
-    with open(full_csv_path, newline="", encoding="utf-8") as csvfile:
-        reader = csv.reader(csvfile, delimiter="\t")
-        header = next(reader)
+    if not year_columns:
+        return []
 
-        fixed_col_indices = {col: i for i, col in enumerate(header) if col in columns}
-        year_indices = [i for i, col in enumerate(header) if col == year_str]
-
-        if not year_indices:
-            return []
+    for row in range(dataset.row_count):
+        if all(not values[row] for values in year_columns):
+            continue
 
-        for row in reader:
-            if all(not row[i].strip() for i in year_indices):
-                continue
+        item = {}
 
-            item = {}
+        for col, values in fixed_columns.items():
+            item[col] = values[row]
 
-            for col, i in fixed_col_indices.items():
-                item[col] = row[i].strip()
+        for idx, values in enumerate(year_columns):
+            col_name = year_str if len(year_columns) == 1 else f"{year_str}_{idx+1}"
+            item[col_name] = values[row]
 
-            for idx, i in enumerate(year_indices):
-                col_name = year_str if len(year_indices) == 1 else f"{year_str}_{idx+1}"
-                item[col_name] = row[i].strip()
+        result.append(item)
 
-            result.append(item)
-            
+    dataset.row_cache[cache_key] = result
     return result
 
-def scrape_table_data_from_site(
-    url: str,
+def fetch_page(url: str) -> str:
+    response = get_session().get(url, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    return response.text
+
+def parse_table_data(
+    html: str,
     year: int,
     parse_row_fn: Callable[[list, int], Optional[dict]],
     expected_col_range: tuple[int, int]
 ) -> list[dict]:
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.text, "html.parser")
-    table = soup.find("table", class_="tb_base tb_dados")
-    if not table:
-        raise ValueError("Data table not found")
-
-    rows = table.find("tbody").find_all("tr")
+    rows = extract_table_rows(html)
     data = []
 
-    for tr in rows:
-        columns = tr.find_all("td")
+    for columns in rows:
         if not expected_col_range[0] <= len(columns) <= expected_col_range[1]:
             continue
 
@@ -86,4 +127,48 @@ def scrape_table_data_from_site(
         if parsed:
             data.append(parsed)
 
-    return data
\ No newline at end of file
+    return data
+
+async def scrape_table_data_from_site(
+    url: str,
+    year: int,
+    parse_row_fn: Callable[[list, int], Optional[dict]],
+    expected_col_range: tuple[int, int],
+    use_snapshot: bool = True
+) -> list[dict]:
+    if use_snapshot:
+        max_age = scrape_cache.ttl_for(year)
+        snapshot = await run_in_threadpool(snapshot_store.load, url, max_age)
+        if snapshot is not None:
+            return snapshot
+
+    # Snapshot misses and forced refreshes of the same URL join one upstream fetch.
+    return await scrape_flights.do(
+        url,
+        lambda: _fetch_table_data(url, year, parse_row_fn, expected_col_range)
+    )
+
+async def _fetch_table_data(
+    url: str,
+    year: int,
+    parse_row_fn: Callable[[list, int], Optional[dict]],
+    expected_col_range: tuple[int, int]
+) -> list[dict]:
+    upstream_breaker.before_call()
+    try:
+        async with host_semaphore(url):
+            with stage_timer("fetch"):
+                html = await run_in_threadpool(fetch_page, url)
+    except Exception:
+        upstream_breaker.record_failure()
+        raise
+    except BaseException:
+        upstream_breaker.release()
+        raise
+    upstream_breaker.record_success()
+
+    with stage_timer("parse"):
+        data = await run_in_threadpool(parse_table_data, html, year, parse_row_fn, expected_col_range)
+
+    await run_in_threadpool(snapshot_store.save, url, data)
+    return data
@@ -0,0 +1,87 @@
+"""Build the binary dataset the API loads at startup.
+
+Every tab and category is read from the Embrapa site (``--source scrape``,
+falling back to the bundled CSV for years that cannot be fetched) or from
+the CSVs in ``app/data`` (``--source csv``), normalized and written to one
+versioned file:
+
+    python -m app.ingest --source csv
+    python -m app.ingest --source scrape --output /srv/vitibrasil.bin
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.core.binary_dataset import TableData, table_from_rows, write_dataset
+from app.core.constants import BINARY_DATASET_PATH, SCRAPE_MAX_IN_FLIGHT
+from app.core.fanout import fan_out
+from app.core.utils import load_from_csv
+from app.scraping.registry import TABS, csv_path_for, iter_targets, scrape_args
+
+logger = logging.getLogger(__name__)
+
+
+def csv_rows(tab: str, category: Optional[str], year: int) -> List[dict]:
+    return load_from_csv(csv_path_for(tab, category), year, TABS[tab]["csv_columns"])
+
+
+async def scrape_rows(max_in_flight: int) -> Tuple[Dict[tuple, Dict[int, List[dict]]], int]:
+    targets = list(iter_targets())
+
+    async def fetch(target):
+        tab, category, year = target
+        return await TABS[tab]["scrape"](*scrape_args(category, year))
+
+    results = await fan_out(targets, fetch, max_in_flight)
+
+    rows: Dict[tuple, Dict[int, List[dict]]] = {}
+    fallbacks = 0
+    for (tab, category, year), result in zip(targets, results):
+        if isinstance(result, BaseException):
+            fallbacks += 1
+            result = csv_rows(tab, category, year)
+        rows.setdefault((tab, category), {})[year] = result
+    return rows, fallbacks
+
+
+def read_csv_rows() -> Dict[tuple, Dict[int, List[dict]]]:
+    rows: Dict[tuple, Dict[int, List[dict]]] = {}
+    for tab, category, year in iter_targets():
+        rows.setdefault((tab, category), {})[year] = csv_rows(tab, category, year)
+    return rows
+
+
+def build_tables(rows: Dict[tuple, Dict[int, List[dict]]]) -> List[TableData]:
+    return [
+        table_from_rows(csv_path_for(tab, category), tab, category, TABS[tab]["csv_columns"][0], rows_by_year)
+        for (tab, category), rows_by_year in rows.items()
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=["scrape", "csv"], default="scrape")
+    parser.add_argument("--output", default=BINARY_DATASET_PATH)
+    parser.add_argument("--max-in-flight", type=int, default=SCRAPE_MAX_IN_FLIGHT)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    start = time.perf_counter()
+    if args.source == "scrape":
+        rows, fallbacks = asyncio.run(scrape_rows(args.max_in_flight))
+        if fallbacks:
+            logger.warning(f"{fallbacks} pages could not be scraped; used the bundled CSV for those years.")
+    else:
+        rows = read_csv_rows()
+
+    header = write_dataset(args.output, build_tables(rows), args.source)
+    logger.info(
+        f"Wrote {len(header['tables'])} tables to {args.output} "
+        f"(version {header['content_hash']}) in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
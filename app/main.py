@@ -1,23 +1,91 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from app.api.bulk_routes import router as bulk_router
 from app.api.commercialization_tab_routes import router as commercialization_router
 from app.api.export_tab_routes import router as export_router
 from app.api.import_tab_routes import router as import_router
 from app.api.processing_tab_routes import router as processing_router
 from app.api.production_tab_routes import router as production_router
+from app.core.binary_dataset import load_binary_dataset, loaded_dataset_info
+from app.core.cache import scrape_cache
+from app.core.circuit_breaker import upstream_breaker
+from app.core.dataset_store import preload_csv_datasets
+from app.core.compression import CompressionMiddleware, compressed_payloads
+from app.core.constants import COMPRESSION_ENABLED, PREFETCH_ENABLED, PROFILING_ENABLED
+from app.core.http_client import close_session, get_session
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.profiling import ProfilingMiddleware
+from app.core.result_index import result_index
+from app.core.serialization import get_response_class
+from app.core.single_flight import scrape_flights
+from app.core.snapshot_store import snapshot_store
+from app.core.scheduler import RefreshScheduler
+from app.scraping.registry import iter_targets, refresh_target, warm_target
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    load_binary_dataset()
+    preload_csv_datasets()
+    get_session()
+
+    scheduler = RefreshScheduler(iter_targets, refresh_target, warm_fn=warm_target, lease_store=snapshot_store)
+    if PREFETCH_ENABLED:
+        scheduler.start()
+
+    yield
+
+    await scheduler.stop()
+    close_session()
+
 
 app = FastAPI(
     title="API Exportações Vitibrasil",
     description="Consulta dados de produção, processamento, comercialização, importação, exportação e publicação durante o período de 1970 a 2024 da Embrapa para Vinho, Uva, Suco e Outros derivados.",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=get_response_class(),
+    lifespan=lifespan
 )
 
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(commercialization_router, prefix="/commercialization")
 app.include_router(export_router, prefix="/export")
 app.include_router(import_router, prefix="/import")
 app.include_router(processing_router, prefix="/processing")
 app.include_router(production_router, prefix="/production")
+app.include_router(bulk_router, prefix="/bulk")
 
 
 @app.get("/")
 async def root():
     return {"message": "API is running!"}
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {
+        "scrape_cache": scrape_cache.stats(),
+        "content_changes": scrape_cache.tracker.stats(),
+        "result_index": result_index.stats(),
+        "compressed_payloads": compressed_payloads.stats(),
+        "dataset": loaded_dataset_info(),
+    }
+
+
+@app.get("/upstream/status")
+async def upstream_status():
+    return {
+        "circuit_breaker": upstream_breaker.stats(),
+        "single_flight": scrape_flights.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,19 +1,30 @@
 from app.core.constants import COMMERCIALIZATION_BASE_URL, COMMERCIALIZATION_CSV_PATH, COMMERCIALIZATION_CSV_COLUMNS
-from app.core.utils import load_from_csv, scrape_table_data_from_site
+from app.core.cache import scrape_cache
+from app.core.metrics import record_scrape, track_fallback
+from app.core.utils import load_from_csv, parse_amount, scrape_table_data_from_site
 
 
-def get_commercialization_data(year: int) -> list[dict]:
+@scrape_cache.cached("commercialization")
+async def scrape_commercialization_data(year: int, refresh: bool = False) -> list[dict]:
     url = COMMERCIALIZATION_BASE_URL.format(year=year)
 
+    return await scrape_table_data_from_site(
+        url,
+        year,
+        parse_row_fn=parse_commercialization_row,
+        expected_col_range=(2, 2),
+        use_snapshot=not refresh
+    )
+
+async def get_commercialization_data(year: int) -> list[dict]:
     try:
-        return scrape_table_data_from_site(
-            url,
-            year,
-            parse_row_fn=parse_commercialization_row,
-            expected_col_range=(2, 2)
-        )
+        data = await scrape_commercialization_data(year)
     except Exception:
-        return load_from_csv(COMMERCIALIZATION_CSV_PATH, year, COMMERCIALIZATION_CSV_COLUMNS)
+        with track_fallback("commercialization", None):
+            return load_from_csv(COMMERCIALIZATION_CSV_PATH, year, COMMERCIALIZATION_CSV_COLUMNS)
+
+    record_scrape("commercialization", None, "success")
+    return data
 
 def parse_commercialization_row(columns, year: int) -> dict:
     product = columns[0].get_text(strip=True)
@@ -36,9 +47,8 @@ def format_commercialization_data(
 
     for row in data:
         product = row["produto"]
-        amount_str = row.get(amount_key, "-").replace(".", "")
     
-        amount = int(amount_str) if amount_str != "-" else 0
+        amount = parse_amount(row.get(amount_key))
 
         if product.isupper():
             product_type = product
@@ -1,21 +1,34 @@
 from typing import Optional
 from app.core.constants import IMPORT_BASE_URL, IMPORT_CATEGORY_MAP, IMPORT_CSV_COLUMNS
-from app.core.utils import load_from_csv, scrape_table_data_from_site
+from app.core.cache import scrape_cache
+from app.core.metrics import record_scrape, track_fallback
+from app.core.utils import load_from_csv, parse_amount, scrape_table_data_from_site
 
 
-def get_import_data(category: str, year: int) -> list[dict]:
+@scrape_cache.cached("import")
+async def scrape_import_data(category: str, year: int, refresh: bool = False) -> list[dict]:
     config = IMPORT_CATEGORY_MAP.get(category)
     url = IMPORT_BASE_URL.format(year=year, suboption=config["suboption"])
 
+    return await scrape_table_data_from_site(
+        url,
+        year,
+        parse_row_fn=parse_import_row,
+        expected_col_range=(3, 3),
+        use_snapshot=not refresh
+    )
+
+async def get_import_data(category: str, year: int) -> list[dict]:
+    config = IMPORT_CATEGORY_MAP.get(category)
+
     try:
-        return scrape_table_data_from_site(
-            url,
-            year,
-            parse_row_fn=parse_import_row,
-            expected_col_range=(3, 3)
-        )
+        data = await scrape_import_data(category, year)
     except Exception:
-        return load_from_csv(config["data_path"], year, IMPORT_CSV_COLUMNS)
+        with track_fallback("import", category):
+            return load_from_csv(config["data_path"], year, IMPORT_CSV_COLUMNS)
+
+    record_scrape("import", category, "success")
+    return data
 
 
 def parse_import_row(columns, year: int) -> dict:
@@ -42,11 +55,9 @@ def format_import_data(
 
     for row in data:
         country = row["País"]
-        amount_str = row.get(amount_key, "-").replace(".", "")
-        value_str = row.get(value_key, "-").replace(".", "")
 
-        amount = int(amount_str) if amount_str != "-" else 0
-        value = int(value_str) if value_str != "-" else 0
+        amount = parse_amount(row.get(amount_key))
+        value = parse_amount(row.get(value_key))
 
         if amount == 0 and value == 0:
             continue
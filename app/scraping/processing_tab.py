@@ -1,21 +1,34 @@
 from typing import Optional
 from app.core.constants import PROCESSING_BASE_URL, PROCESSING_CATEGORY_MAP, PROCESSING_CSV_COLUMNS
-from app.core.utils import load_from_csv, scrape_table_data_from_site
+from app.core.cache import scrape_cache
+from app.core.metrics import record_scrape, track_fallback
+from app.core.utils import load_from_csv, parse_amount, scrape_table_data_from_site
 
 
-def get_processing_data(category: str, year: int) -> list[dict]:
+@scrape_cache.cached("processing")
+async def scrape_processing_data(category: str, year: int, refresh: bool = False) -> list[dict]:
     config = PROCESSING_CATEGORY_MAP.get(category)
     url = PROCESSING_BASE_URL.format(year=year, suboption=config["suboption"])
 
+    return await scrape_table_data_from_site(
+        url,
+        year,
+        parse_row_fn=parse_processing_row,
+        expected_col_range=(2, 2),
+        use_snapshot=not refresh
+    )
+
+async def get_processing_data(category: str, year: int) -> list[dict]:
+    config = PROCESSING_CATEGORY_MAP.get(category)
+
     try:
-        return scrape_table_data_from_site(
-            url,
-            year,
-            parse_row_fn=parse_processing_row,
-            expected_col_range=(2, 2)
-        )
+        data = await scrape_processing_data(category, year)
     except Exception:
-        return load_from_csv(config["data_path"], year, PROCESSING_CSV_COLUMNS)
+        with track_fallback("processing", category):
+            return load_from_csv(config["data_path"], year, PROCESSING_CSV_COLUMNS)
+
+    record_scrape("processing", category, "success")
+    return data
 
 def parse_processing_row(columns, year: int) -> dict:
     cultivate = columns[0].get_text(strip=True)
@@ -39,9 +52,8 @@ def format_processing_data(
 
     for row in data:
         cultivate = row["cultivar"]
-        amount_str = row.get(amount_key, "-").replace(".", "")
     
-        amount = int(amount_str) if amount_str != "-" else 0
+        amount = parse_amount(row.get(amount_key))
 
         if cultivate.isupper():
             processing_type = cultivate
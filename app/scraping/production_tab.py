@@ -1,19 +1,30 @@
 from app.core.constants import PRODUCTION_BASE_URL, PRODUCTION_CSV_PATH, PRODUCTION_CSV_COLUMNS
-from app.core.utils import load_from_csv, scrape_table_data_from_site
+from app.core.cache import scrape_cache
+from app.core.metrics import record_scrape, track_fallback
+from app.core.utils import load_from_csv, parse_amount, scrape_table_data_from_site
 
 
-def get_production_data(year: int) -> list[dict]:
+@scrape_cache.cached("production")
+async def scrape_production_data(year: int, refresh: bool = False) -> list[dict]:
     url = PRODUCTION_BASE_URL.format(year=year)
 
+    return await scrape_table_data_from_site(
+        url,
+        year,
+        parse_row_fn=parse_production_row,
+        expected_col_range=(2, 2),
+        use_snapshot=not refresh
+    )
+
+async def get_production_data(year: int) -> list[dict]:
     try:
-        return scrape_table_data_from_site(
-            url,
-            year,
-            parse_row_fn=parse_production_row,
-            expected_col_range=(2, 2)
-        )
+        data = await scrape_production_data(year)
     except Exception:
-        return load_from_csv(PRODUCTION_CSV_PATH, year, PRODUCTION_CSV_COLUMNS)
+        with track_fallback("production", None):
+            return load_from_csv(PRODUCTION_CSV_PATH, year, PRODUCTION_CSV_COLUMNS)
+
+    record_scrape("production", None, "success")
+    return data
 
 
 def parse_production_row(columns, year: int) -> dict:
@@ -37,8 +48,7 @@ def format_production_data(
 
     for row in data:
         product = row["produto"]
-        amount_str = row.get(amount_key, "-").replace(".", "")
-        amount = int(amount_str) if amount_str != "-" else 0
+        amount = parse_amount(row.get(amount_key))
 
         if product.isupper():
             product_type = product
@@ -0,0 +1,182 @@
+import logging
+from typing import AsyncIterator, Iterator, Optional, Tuple
+
+from app.core.constants import (
+    COMMERCIALIZATION_CSV_COLUMNS,
+    COMMERCIALIZATION_CSV_PATH,
+    COMMERCIALIZATION_END_YEAR,
+    COMMERCIALIZATION_START_YEAR,
+    EXPORT_CATEGORY_MAP,
+    EXPORT_CSV_COLUMNS,
+    EXPORT_END_YEAR,
+    EXPORT_START_YEAR,
+    IMPORT_CATEGORY_MAP,
+    IMPORT_CSV_COLUMNS,
+    IMPORT_END_YEAR,
+    IMPORT_START_YEAR,
+    PROCESSING_CATEGORY_MAP,
+    PROCESSING_CSV_COLUMNS,
+    PROCESSING_END_YEAR,
+    PROCESSING_START_YEAR,
+    PRODUCTION_CSV_COLUMNS,
+    PRODUCTION_CSV_PATH,
+    PRODUCTION_END_YEAR,
+    PRODUCTION_START_YEAR,
+)
+from app.core.fanout import iter_fan_out
+from app.core.result_index import result_index
+from app.core.utils import load_from_csv
+from app.scraping.commercialization_tab import (
+    format_commercialization_data,
+    get_commercialization_data,
+    scrape_commercialization_data,
+)
+from app.scraping.export_tab import format_export_data, get_export_data, scrape_export_data
+from app.scraping.import_tab import format_import_data, get_import_data, scrape_import_data
+from app.scraping.processing_tab import format_processing_data, get_processing_data, scrape_processing_data
+from app.scraping.production_tab import format_production_data, get_production_data, scrape_production_data
+
+logger = logging.getLogger(__name__)
+
+TABS = {
+    "production": {
+        "scrape": scrape_production_data,
+        "get": get_production_data,
+        "format": format_production_data,
+        "categories": None,
+        "csv_path": PRODUCTION_CSV_PATH,
+        "csv_columns": PRODUCTION_CSV_COLUMNS,
+        "fields": ["product", "type", "year", "amount"],
+        "start_year": PRODUCTION_START_YEAR,
+        "end_year": PRODUCTION_END_YEAR,
+    },
+    "processing": {
+        "scrape": scrape_processing_data,
+        "get": get_processing_data,
+        "format": format_processing_data,
+        "categories": PROCESSING_CATEGORY_MAP,
+        "csv_path": None,
+        "csv_columns": PROCESSING_CSV_COLUMNS,
+        "fields": ["cultivate", "type", "year", "category", "amount"],
+        "start_year": PROCESSING_START_YEAR,
+        "end_year": PROCESSING_END_YEAR,
+    },
+    "commercialization": {
+        "scrape": scrape_commercialization_data,
+        "get": get_commercialization_data,
+        "format": format_commercialization_data,
+        "categories": None,
+        "csv_path": COMMERCIALIZATION_CSV_PATH,
+        "csv_columns": COMMERCIALIZATION_CSV_COLUMNS,
+        "fields": ["product", "type", "year", "amount"],
+        "start_year": COMMERCIALIZATION_START_YEAR,
+        "end_year": COMMERCIALIZATION_END_YEAR,
+    },
+    "import": {
+        "scrape": scrape_import_data,
+        "get": get_import_data,
+        "format": format_import_data,
+        "categories": IMPORT_CATEGORY_MAP,
+        "csv_path": None,
+        "csv_columns": IMPORT_CSV_COLUMNS,
+        "fields": ["country", "year", "category", "amount", "value"],
+        "start_year": IMPORT_START_YEAR,
+        "end_year": IMPORT_END_YEAR,
+    },
+    "export": {
+        "scrape": scrape_export_data,
+        "get": get_export_data,
+        "format": format_export_data,
+        "categories": EXPORT_CATEGORY_MAP,
+        "csv_path": None,
+        "csv_columns": EXPORT_CSV_COLUMNS,
+        "fields": ["country", "year", "category", "amount", "value"],
+        "start_year": EXPORT_START_YEAR,
+        "end_year": EXPORT_END_YEAR,
+    },
+}
+
+Target = Tuple[str, Optional[str], int]
+
+
+def scrape_args(category: Optional[str], year: int) -> tuple:
+    return (year,) if category is None else (category, year)
+
+
+def iter_targets() -> Iterator[Target]:
+    for tab, config in TABS.items():
+        categories = config["categories"] or [None]
+        for category in categories:
+            for year in range(config["start_year"], config["end_year"] + 1):
+                yield tab, category, year
+
+
+def csv_path_for(tab: str, category: Optional[str]) -> str:
+    config = TABS[tab]
+    if category is None:
+        return config["csv_path"]
+    return config["categories"][category]["data_path"]
+
+
+def format_with_year(tab: str, category: Optional[str], data: list[dict], year: int) -> list[dict]:
+    config = TABS[tab]
+    if category is None:
+        return config["format"](data, year, include_year=True)
+    return config["format"](
+        data,
+        year,
+        category=config["categories"][category]["name"],
+        include_year_and_category=True
+    )
+
+
+def iter_csv_rows(tab: str, category: Optional[str]) -> Iterator[dict]:
+    """Normalized rows for every year of a tab/category from the in-memory CSV store."""
+    config = TABS[tab]
+    csv_path = csv_path_for(tab, category)
+    for year in range(config["start_year"], config["end_year"] + 1):
+        data = load_from_csv(csv_path, year, config["csv_columns"])
+        yield from format_with_year(tab, category, data, year)
+
+
+async def iter_all_rows(tab: str) -> AsyncIterator[dict]:
+    """Formatted rows for every category and year of a tab, as each year arrives.
+
+    Years that fail to load or format are logged and skipped, so one bad
+    year does not end an ``/all`` listing.
+    """
+    config = TABS[tab]
+    jobs = [
+        (category, year)
+        for category in config["categories"] or [None]
+        for year in range(config["start_year"], config["end_year"] + 1)
+    ]
+
+    async for (category, year), data in iter_fan_out(jobs, lambda job: config["get"](*scrape_args(*job))):
+        try:
+            if isinstance(data, BaseException):
+                raise data
+            if data is None:
+                continue
+
+            formatted = result_index.get(
+                (tab, category, year, True),
+                data,
+                lambda rows: format_with_year(tab, category, rows, year)
+            )
+        except Exception as e:
+            logger.warning(f"Error processing {tab}/{category} year={year}: {e}")
+            continue
+
+        for item in formatted:
+            yield item
+
+
+async def warm_target(target: Target) -> list[dict]:
+    tab, category, year = target
+    return await TABS[tab]["scrape"](*scrape_args(category, year))
+
+
+async def refresh_target(target: Target) -> list[dict]:
+    tab, category, year = target
+    return await TABS[tab]["scrape"].refresh(*scrape_args(category, year))
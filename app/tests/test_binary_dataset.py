@@ -0,0 +1,93 @@
+from app.core import dataset_store
+from app.core.binary_dataset import MISSING, load_binary_dataset, normalize_amount, read_dataset, table_from_rows, write_dataset
+from app.core.constants import EXPORT_CATEGORY_MAP, EXPORT_CSV_COLUMNS
+from app.core.utils import load_from_csv
+from app.scraping.production_tab import format_production_data
+
+
+def test_normalize_amount():
+    assert normalize_amount("83.300.735") == 83300735
+    assert normalize_amount(" 120 ") == 120
+    assert normalize_amount("35881118,23") == 35881118
+    assert normalize_amount("-") == MISSING
+    assert normalize_amount("*") == MISSING
+    assert normalize_amount("nd") == MISSING
+    assert normalize_amount(None) == MISSING
+
+
+def test_table_from_rows_aligns_labels_by_group():
+    rows_by_year = {
+        2020: [{"produto": "VINHO DE MESA", "2020": "10"}, {"produto": "Tinto", "2020": "7"},
+               {"produto": "VINHO FINO", "2020": "3"}, {"produto": "Tinto", "2020": "3"}],
+        2021: [{"produto": "VINHO DE MESA", "2021": "*"}, {"produto": "  Tinto", "2021": "8"}],
+        2022: [],
+    }
+
+    table = table_from_rows("production.csv", "production", None, "produto", rows_by_year)
+
+    assert table.years == [2020, 2021]
+    assert table.labels == ["VINHO DE MESA", "Tinto", "VINHO FINO", "Tinto"]
+    assert table.amount == [[10, 7, 3, 3], [MISSING, 8, MISSING, MISSING]]
+    assert table.value is None
+
+
+def test_round_trip_matches_csv_rows(tmp_path):
+    csv_path = EXPORT_CATEGORY_MAP["vinhos"]["data_path"]
+    rows_by_year = {year: load_from_csv(csv_path, year, EXPORT_CSV_COLUMNS) for year in (2019, 2020)}
+    path = str(tmp_path / "dataset.bin")
+
+    header = write_dataset(path, [table_from_rows(csv_path, "export", "vinhos", "País", rows_by_year)], "csv")
+    dataset = read_dataset(path)
+
+    assert dataset.header["content_hash"] == header["content_hash"]
+    table = dataset.tables[csv_path]
+    assert table.column_indices("2020") == [3, 4]
+    amounts = [normalize_amount(row["2020_1"]) for row in rows_by_year[2020]]
+    assert list(table.year_values(1)) == [0 if amount == MISSING else amount for amount in amounts]
+    assert list(table.year_missing(1)) == [amount == MISSING for amount in amounts]
+    assert dataset.info()["mapped"]
+
+    try:
+        assert load_binary_dataset(path) is not None
+        assert dataset_store.get_csv_dataset(csv_path).header == table.header
+        binary_rows = load_from_csv(csv_path, 2020, EXPORT_CSV_COLUMNS)
+    finally:
+        dataset_store.clear_csv_datasets()
+
+    expected = [
+        {key: ("-" if normalize_amount(value) == MISSING else str(normalize_amount(value))) if key != "País" else value
+         for key, value in row.items()}
+        for row in rows_by_year[2020]
+    ]
+    assert binary_rows == expected
+
+
+def test_truncated_files_are_ignored(tmp_path):
+    csv_path = EXPORT_CATEGORY_MAP["vinhos"]["data_path"]
+    rows_by_year = {2020: load_from_csv(csv_path, 2020, EXPORT_CSV_COLUMNS)}
+    path = tmp_path / "dataset.bin"
+    write_dataset(str(path), [table_from_rows(csv_path, "export", "vinhos", "País", rows_by_year)], "csv")
+    data = path.read_bytes()
+
+    for size in (0, 10, 200, len(data) - 8):
+        path.write_bytes(data[:size])
+        assert load_binary_dataset(str(path)) is None
+
+
+def test_labels_first_seen_in_later_years_stay_in_their_group():
+    rows_by_year = {
+        2010: [{"produto": "VINHO", "2010": "10"}, {"produto": "Tinto", "2010": "10"},
+               {"produto": "SUCO", "2010": "4"}, {"produto": "Integral", "2010": "4"}],
+        2011: [{"produto": "VINHO", "2011": "12"}, {"produto": "Tinto", "2011": "9"}, {"produto": "Rose", "2011": "3"},
+               {"produto": "SUCO", "2011": "5"}, {"produto": "Integral", "2011": "5"}],
+        2012: [{"produto": "ESPUMANTE", "2012": "1"}, {"produto": "Moscatel", "2012": "1"},
+               {"produto": "VINHO", "2012": "2"}, {"produto": "Tinto", "2012": "2"}],
+    }
+
+    table = table_from_rows("production.csv", "production", None, "produto", rows_by_year)
+
+    assert table.labels == ["ESPUMANTE", "Moscatel", "VINHO", "Tinto", "Rose", "SUCO", "Integral"]
+    assert table.amount[1] == [MISSING, MISSING, 12, 9, 3, 5, 5]
+
+    data = [{"produto": label, "2011": str(amount)} for label, amount in zip(table.labels, table.amount[1]) if amount != MISSING]
+    assert {"product": "Rose", "amount": 3, "type": "VINHO"} in format_production_data(data, 2011)
@@ -0,0 +1,67 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from app.core.bulk_export import BulkExportCache, BulkTable, iter_ndjson, render_arrow, render_csv_gzip, render_ndjson
+
+FIELDS = ["product", "type", "year", "amount"]
+ROWS = [
+    {"product": "Tinto", "type": "VINHO DE MESA", "year": 2020, "amount": 10},
+    {"product": "Suco de uva", "year": 2020, "amount": 5},
+]
+
+
+def test_bulk_table_is_column_major():
+    table = BulkTable(FIELDS, ROWS)
+
+    assert table.row_count == 2
+    assert table.columns["amount"] == [10, 5]
+    assert table.columns["type"] == ["VINHO DE MESA", None]
+
+
+def test_render_csv_gzip_and_ndjson():
+    table = BulkTable(FIELDS, ROWS)
+
+    rows = list(csv.reader(io.StringIO(gzip.decompress(render_csv_gzip(table)).decode("utf-8"))))
+    assert rows == [FIELDS, ["Tinto", "VINHO DE MESA", "2020", "10"], ["Suco de uva", "", "2020", "5"]]
+
+    lines = [json.loads(line) for line in render_ndjson(table).decode("utf-8").splitlines()]
+    assert lines[1] == {"product": "Suco de uva", "type": None, "year": 2020, "amount": 5}
+
+
+def test_streamed_chunks_match_the_rendered_payload():
+    rows = [dict(ROWS[0], amount=i) for i in range(25)]
+    table = BulkTable(FIELDS, rows)
+
+    assert len(list(iter_ndjson(table, chunk_rows=10))) == 3
+    assert b"".join(iter_ndjson(table, chunk_rows=10)) == render_ndjson(table)
+
+    cache = BulkExportCache()
+    streamed = b"".join(cache.stream("production", "csv", table))
+    assert gzip.decompress(streamed) == gzip.decompress(render_csv_gzip(table))
+    assert cache.cached_payload("production", "csv") == streamed
+
+
+def test_render_arrow_round_trips():
+    pyarrow = pytest.importorskip("pyarrow")
+    table = BulkTable(FIELDS, ROWS)
+
+    arrow_table = pyarrow.ipc.open_stream(render_arrow(table)).read_all()
+    assert arrow_table.column("amount").to_pylist() == [10, 5]
+
+
+def test_cache_builds_table_and_payload_once():
+    cache = BulkExportCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return BulkTable(FIELDS, ROWS)
+
+    table = cache.table("key", build)
+    assert cache.table("key", build) is table
+    assert cache.payload("key", "ndjson", table) is cache.payload("key", "ndjson", table)
+    assert len(builds) == 1
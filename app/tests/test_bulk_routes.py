@@ -0,0 +1,49 @@
+import gzip
+import json
+from http import HTTPStatus
+
+from .constants import EXPORT_VALID_CATEGORY, INVALID_CATEGORY
+
+BASE_BULK_URL = "/bulk"
+
+
+def test_get_bulk_export_csv(client):
+    response = client.get(f"{BASE_BULK_URL}/export/{EXPORT_VALID_CATEGORY}")
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/gzip"
+    assert "etag" in response.headers and "cache-control" in response.headers
+
+    stored = client.get(f"{BASE_BULK_URL}/export/{EXPORT_VALID_CATEGORY}")
+    assert stored.content == response.content
+    assert int(stored.headers["content-length"]) == len(stored.content)
+
+    lines = gzip.decompress(response.content).decode("utf-8").splitlines()
+    assert lines[0] == "country,year,category,amount,value"
+    assert len(lines) > 1
+
+    cached = client.get(f"{BASE_BULK_URL}/export/{EXPORT_VALID_CATEGORY}", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_get_bulk_production_ndjson(client):
+    response = client.get(f"{BASE_BULK_URL}/production", params={"format": "ndjson"})
+    assert response.status_code == HTTPStatus.OK
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert all({"product", "type", "year", "amount"} <= row.keys() for row in rows)
+
+
+def test_get_bulk_invalid_targets(client):
+    assert client.get(f"{BASE_BULK_URL}/export/{INVALID_CATEGORY}").status_code == HTTPStatus.BAD_REQUEST
+    assert client.get(f"{BASE_BULK_URL}/production/{INVALID_CATEGORY}").status_code == HTTPStatus.BAD_REQUEST
+    assert client.get(f"{BASE_BULK_URL}/unknown").status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_get_bulk_processing_keeps_years_with_irregular_cells(client):
+    response = client.get(f"{BASE_BULK_URL}/processing/viniferas", params={"format": "ndjson"})
+    assert response.status_code == HTTPStatus.OK
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    cabernet_franc = {row["year"]: row["amount"] for row in rows if row["cultivate"] == "Cabernet Franc"}
+    assert cabernet_franc[2021] == 16626545
+    assert cabernet_franc[2023] == 2152213
+    assert 2019 not in cabernet_franc and 2022 not in cabernet_franc
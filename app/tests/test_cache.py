@@ -0,0 +1,117 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.core.cache import ScrapeCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+CLOSED_YEAR = 2000
+OPEN_YEAR = date.today().year
+
+
+def test_lru_eviction_drops_least_recently_used_entry():
+    cache = ScrapeCache(maxsize=2)
+    cache.set(("export", "vinhos", 2000), "a")
+    cache.set(("export", "vinhos", 2001), "b")
+    cache.get(("export", "vinhos", 2000))
+    cache.set(("export", "vinhos", 2002), "c")
+
+    assert cache.get(("export", "vinhos", 2001)) is None
+    assert cache.get(("export", "vinhos", 2000)) == "a"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_open_years_expire_before_closed_years():
+    clock = FakeClock()
+    cache = ScrapeCache(closed_year_ttl=100, open_year_ttl=10, clock=clock)
+    cache.set(("production", None, CLOSED_YEAR), "closed")
+    cache.set(("production", None, OPEN_YEAR), "open")
+
+    clock.now = 50
+
+    assert cache.get(("production", None, OPEN_YEAR)) is None
+    assert cache.get(("production", None, CLOSED_YEAR)) == "closed"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cached_decorator_counts_hits_and_skips_failures():
+    cache = ScrapeCache()
+    calls = []
+
+    @cache.cached("export")
+    async def scrape(category, year):
+        calls.append((category, year))
+        if year == 2001:
+            raise ConnectionError("upstream down")
+        return [{"País": "Brasil"}]
+
+    asyncio.run(scrape("vinhos", 2000))
+    asyncio.run(scrape("vinhos", 2000))
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            asyncio.run(scrape("vinhos", 2001))
+
+    assert calls == [("vinhos", 2000), ("vinhos", 2001), ("vinhos", 2001)]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+
+def test_refresh_keeps_previous_rows_when_content_is_unchanged():
+    cache = ScrapeCache()
+    pages = [[{"País": "Brasil", "2000_1": "10"}]]
+
+    @cache.cached("export")
+    async def scrape(category, year, refresh=False):
+        return [dict(row) for row in pages[-1]]
+
+    first = asyncio.run(scrape("vinhos", CLOSED_YEAR))
+    assert asyncio.run(scrape.refresh("vinhos", CLOSED_YEAR)) is first
+
+    pages.append([{"País": "Brasil", "2000_1": "12"}])
+    changed = asyncio.run(scrape.refresh("vinhos", CLOSED_YEAR))
+
+    assert changed is not first
+    assert cache.get(("export", "vinhos", CLOSED_YEAR)) is changed
+    assert cache.tracker.stats()["changed"] == 1
+    assert cache.tracker.stats()["unchanged"] == 1
+
+
+def test_recently_changed_closed_years_use_the_open_year_ttl():
+    clock = FakeClock()
+    cache = ScrapeCache(closed_year_ttl=100, open_year_ttl=10, clock=clock)
+    key = ("production", None, CLOSED_YEAR)
+
+    cache.tracker.record(key, ["a"])
+    assert cache.ttl_for_key(key) == 100
+
+    cache.tracker.record(key, ["b"])
+    cache.set(key, ["b"])
+    clock.now = 50
+
+    assert cache.ttl_for_key(key) == 10
+    assert cache.get(key) is None
+
+
+def test_expired_entries_with_unchanged_content_keep_their_rows():
+    clock = FakeClock()
+    cache = ScrapeCache(closed_year_ttl=100, clock=clock)
+
+    @cache.cached("production")
+    async def scrape(year, refresh=False):
+        return [{"produto": "Tinto", "2000": "10"}]
+
+    first = asyncio.run(scrape(CLOSED_YEAR))
+    clock.now = 150
+
+    assert asyncio.run(scrape(CLOSED_YEAR)) is first
+    assert cache.stats()["expirations"] == 1
+    assert cache.tracker.stats()["unchanged"] == 1
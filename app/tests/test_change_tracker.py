@@ -0,0 +1,63 @@
+from app.core.cache import ScrapeCache
+from app.core.change_tracker import ChangeTracker
+from app.core.snapshot_store import SnapshotStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+KEY = ("export", "vinhos", 2000)
+
+
+def test_first_observation_is_a_baseline_not_a_change():
+    tracker = ChangeTracker(clock=FakeClock())
+
+    assert tracker.record(KEY, [{"País": "Brasil"}])
+    assert tracker.get(KEY).changed_at is None
+    assert not tracker.changed_recently(KEY)
+    assert tracker.stats()["changed"] == 0
+
+
+def test_changes_are_recent_until_the_window_passes():
+    clock = FakeClock()
+    tracker = ChangeTracker(recent_change_window=60, clock=clock)
+    tracker.record(KEY, [{"País": "Brasil", "2000_1": "1"}])
+
+    clock.now += 10
+    assert not tracker.record(KEY, [{"2000_1": "1", "País": "Brasil"}])
+    assert tracker.get(KEY).checked_at == clock.now
+
+    assert tracker.record(KEY, [{"País": "Brasil", "2000_1": "2"}])
+    assert tracker.get(KEY).changed_at == clock.now
+    assert tracker.changed_recently(KEY)
+
+    clock.now += 61
+    assert not tracker.changed_recently(KEY)
+    assert tracker.stats() == {"tracked": 1, "changed": 1, "unchanged": 1, "recently_changed": 0}
+
+
+def test_changes_seen_by_one_worker_reach_the_others(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    leader = ScrapeCache(closed_year_ttl=10_000, open_year_ttl=10, tracker=ChangeTracker(store=store))
+    follower = ScrapeCache(closed_year_ttl=10_000, open_year_ttl=10, tracker=ChangeTracker(store=store))
+    old, new = [{"País": "Brasil", "2000_1": "1"}], [{"País": "Brasil", "2000_1": "2"}]
+
+    for cache in (leader, follower):
+        cache.tracker.record(KEY, old)
+        cache.set(KEY, old)
+    assert follower.sync_changes() == 0
+
+    leader.tracker.record(KEY, new)
+
+    assert follower.sync_changes() == 1
+    assert follower.get(KEY) is None
+    assert follower.ttl_for_key(KEY) == 10
+
+    follower.tracker.record(KEY, new)
+    assert follower.tracker.get(KEY).changed_at == leader.tracker.get(KEY).changed_at
+    assert follower.sync_changes() == 0
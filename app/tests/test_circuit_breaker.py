@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.core import utils
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.scraping.production_tab import parse_production_row
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def fail(breaker, times):
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=10, clock=FakeClock())
+    fail(breaker, 3)
+
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()["rejected_calls"] == 1
+
+
+def test_half_open_allows_single_probe_and_closes_on_success():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+    fail(breaker, 1)
+    clock.now = 10
+
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10, clock=clock)
+    fail(breaker, 1)
+    clock.now = 10
+    fail(breaker, 1)
+
+    assert breaker.state == OPEN
+    assert breaker.stats()["retry_in"] == 10
+
+
+def test_open_breaker_skips_upstream(monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+    calls = []
+
+    def failing_fetch(url):
+        calls.append(url)
+        raise ConnectionError("upstream down")
+
+    monkeypatch.setattr(utils, "upstream_breaker", breaker)
+    monkeypatch.setattr(utils, "fetch_page", failing_fetch)
+
+    for _ in range(3):
+        with pytest.raises((ConnectionError, CircuitOpenError)):
+            asyncio.run(utils.scrape_table_data_from_site(
+                "http://upstream.test/?ano=2000", 2000, parse_production_row, (2, 2), use_snapshot=False
+            ))
+
+    assert len(calls) == 1
+    assert breaker.state == OPEN
@@ -0,0 +1,71 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressedPayloadCache, CompressionMiddleware, negotiate_encoding
+
+ROWS = [{"country": "Paraguai", "amount": i, "value": i * 2, "year": 2020, "category": "Vinhos de mesa"} for i in range(200)]
+
+
+def make_client(cache: CompressedPayloadCache) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache=cache)
+
+    @app.get("/rows")
+    async def rows():
+        return JSONResponse(ROWS, headers={"ETag": 'W/"rows"'})
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(50):
+                yield f'{{"row": {i}}}\n'
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return TestClient(app)
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("*") in ("br", "gzip")
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("") is None
+
+
+def test_large_bodies_are_compressed_and_cached_by_etag():
+    cache = CompressedPayloadCache()
+    client = make_client(cache)
+
+    first = client.get("/rows", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/rows", headers={"Accept-Encoding": "gzip"})
+
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert first.json() == second.json() == ROWS
+    assert int(first.headers["content-length"]) < len(first.content)
+    assert cache.stats()["hits"] == 1
+
+
+def test_small_and_unnegotiated_bodies_pass_through():
+    client = make_client(CompressedPayloadCache())
+
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "content-encoding" not in client.get("/rows", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_streamed_bodies_are_compressed_incrementally():
+    client = make_client(CompressedPayloadCache())
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode().splitlines()[-1] == '{"row": 49}'
@@ -0,0 +1,72 @@
+import asyncio
+from datetime import date
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.conditional import DatasetVersions, cache_control_for, check_not_modified, make_etag
+from app.core.snapshot_store import SnapshotStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_request(query: str = "", headers: dict = None) -> Request:
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "path": "/", "query_string": query.encode(), "headers": raw_headers})
+
+
+def test_version_only_changes_when_content_changes():
+    clock = FakeClock()
+    versions = DatasetVersions(clock=clock)
+    first = asyncio.run(versions.observe("key", [{"amount": 1}]))
+
+    clock.now += 60
+    assert asyncio.run(versions.observe("key", [{"amount": 1}])) == first
+
+    clock.now += 60
+    changed = asyncio.run(versions.observe("key", [{"amount": 2}]))
+    assert changed.digest != first.digest
+    assert changed.last_modified == int(clock.now)
+
+
+def test_check_not_modified_honors_etag_and_date():
+    version = asyncio.run(DatasetVersions(clock=FakeClock()).observe("key", [{"amount": 1}]))
+    response = Response()
+
+    assert check_not_modified(make_request(), response, version, 2000) is None
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    assert check_not_modified(make_request(headers={"If-None-Match": etag}), Response(), version, 2000).status_code == 304
+    assert check_not_modified(make_request(headers={"If-Modified-Since": last_modified}), Response(), version, 2000).status_code == 304
+    assert check_not_modified(make_request(headers={"If-None-Match": '"other"'}), Response(), version, 2000) is None
+    assert check_not_modified(make_request("top=3", {"If-None-Match": etag}), Response(), version, 2000) is None
+
+
+def test_etag_varies_with_query_and_cache_control_with_year():
+    version = asyncio.run(DatasetVersions(clock=FakeClock()).observe("key", []))
+
+    assert make_etag(version) != make_etag(version, "offset=10")
+    assert "max-age=86400" in cache_control_for(2000)
+    assert "max-age=60" in cache_control_for(date.today().year)
+
+
+def test_last_modified_is_shared_between_workers(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    first_clock, second_clock = FakeClock(), FakeClock()
+    second_clock.now += 3600
+
+    key = ("export", "vinhos", 2000)
+
+    first = asyncio.run(DatasetVersions(clock=first_clock, store=store).observe(key, [{"amount": 1}]))
+    second = asyncio.run(DatasetVersions(clock=second_clock, store=store).observe(key, [{"amount": 1}]))
+    assert second == first
+
+    changed = asyncio.run(DatasetVersions(clock=second_clock, store=store).observe(key, [{"amount": 2}]))
+    assert changed.last_modified == int(second_clock.now)
@@ -0,0 +1,27 @@
+from unittest.mock import patch
+
+from app.core import dataset_store
+from app.core.constants import EXPORT_CATEGORY_MAP, EXPORT_CSV_COLUMNS
+from app.core.utils import load_from_csv
+
+
+def test_csv_is_parsed_once_per_path():
+    dataset_store.clear_csv_datasets()
+    csv_path = EXPORT_CATEGORY_MAP["vinhos"]["data_path"]
+
+    with patch.object(dataset_store, "parse_csv_dataset", wraps=dataset_store.parse_csv_dataset) as parse:
+        for year in range(1970, 2025):
+            load_from_csv(csv_path, year, EXPORT_CSV_COLUMNS)
+
+    assert parse.call_count == 1
+
+
+def test_load_from_csv_splits_duplicated_year_columns():
+    data = load_from_csv(EXPORT_CATEGORY_MAP["vinhos"]["data_path"], 2020, EXPORT_CSV_COLUMNS)
+
+    assert data
+    assert set(data[0]) == {"País", "2020_1", "2020_2"}
+
+
+def test_load_from_csv_unknown_year_returns_empty():
+    assert load_from_csv(EXPORT_CATEGORY_MAP["vinhos"]["data_path"], 1900, EXPORT_CSV_COLUMNS) == []
@@ -1,3 +1,5 @@
+import json
+import pytest
 from http import HTTPStatus
 from .constants import (
     EXPORT_VALID_CATEGORY,
@@ -46,3 +48,53 @@ def test_get_all_export_data(client):
         assert all("country" in item for item in data)
         assert all("amount" in item for item in data)
         assert all("value" in item for item in data)
+
+
+def test_get_all_export_data_stream(client):
+    response = client.get(f"{BASE_EXPORT_URL}/all", params={"offset": 0, "limit": 10, "stream": True})
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) <= 10
+    assert all("country" in item for item in rows)
+    assert all("category" in item for item in rows)
+    assert all("year" in item for item in rows)
+
+
+def test_get_export_data_range(client):
+    pytest.importorskip("numpy")
+    response = client.get(
+        f"{BASE_EXPORT_URL}/{EXPORT_VALID_CATEGORY}",
+        params={"start": 2018, "end": VALID_YEAR, "totals": True, "top": 5},
+    )
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data["years"] == [2018, 2019, 2020]
+    assert len(data["items"]) <= 5
+    totals = [item["total_amount"] for item in data["items"]]
+    assert totals == sorted(totals, reverse=True)
+    assert all(len(item["value"]) == 3 for item in data["items"])
+
+
+def test_get_export_data_range_invalid(client):
+    response = client.get(f"{BASE_EXPORT_URL}/{EXPORT_VALID_CATEGORY}", params={"start": VALID_YEAR, "end": 2010})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "Invalid year range" in response.json()["detail"]
+
+
+def test_get_export_data_top_by_value(client):
+    response = client.get(
+        f"{BASE_EXPORT_URL}/{EXPORT_VALID_CATEGORY}/{VALID_YEAR}",
+        params={"sort_by": "value", "top": 3},
+    )
+    assert response.status_code in [HTTPStatus.OK, HTTPStatus.NO_CONTENT]
+    if response.status_code == HTTPStatus.OK:
+        values = [item["value"] for item in response.json()]
+        assert len(values) <= 3
+        assert values == sorted(values, reverse=True)
+
+
+def test_get_export_data_invalid_sort_key(client):
+    response = client.get(f"{BASE_EXPORT_URL}/{EXPORT_VALID_CATEGORY}/{VALID_YEAR}", params={"sort_by": "price"})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "Invalid sort key" in response.json()["detail"]
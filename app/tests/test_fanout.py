@@ -0,0 +1,55 @@
+import asyncio
+
+from app.core.fanout import fan_out, iter_fan_out
+from app.core.pipeline import take_page
+
+
+def test_fan_out_preserves_job_order_and_bounds_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def fetch(job):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (job % 3))
+        in_flight -= 1
+        return job * 10
+
+    results = asyncio.run(fan_out(range(20), fetch, max_in_flight=4))
+
+    assert results == [job * 10 for job in range(20)]
+    assert peak == 4
+
+
+def test_fan_out_returns_exceptions_in_place():
+    async def fetch(job):
+        if job == 1:
+            raise ValueError("boom")
+        return job
+
+    results = asyncio.run(fan_out([0, 1, 2], fetch))
+
+    assert results[0] == 0
+    assert isinstance(results[1], ValueError)
+    assert results[2] == 2
+
+
+def test_iter_fan_out_stops_fetching_when_consumer_stops():
+    fetched = []
+
+    async def fetch(job):
+        fetched.append(job)
+        await asyncio.sleep(0)
+        return job
+
+    async def consume():
+        rows = iter_fan_out(range(100), fetch, max_in_flight=4)
+        page, seen = await take_page(rows, offset=2, limit=3)
+        return page, seen
+
+    page, seen = asyncio.run(consume())
+
+    assert page == [(2, 2), (3, 3), (4, 4)]
+    assert seen == 5
+    assert len(fetched) < 10
@@ -0,0 +1,74 @@
+import pytest
+
+from app.core import utils
+from app.core.html_table import extract_table_rows
+from app.scraping.commercialization_tab import parse_commercialization_row
+from app.scraping.export_tab import parse_export_row
+from app.scraping.import_tab import parse_import_row
+from app.scraping.processing_tab import parse_processing_row
+from app.scraping.production_tab import parse_production_row
+
+PAGE = """
+<html><body>
+<table class="tb_base"><tbody><tr><td>menu</td><td>ignored</td></tr></tbody></table>
+<script>var cls = "nothing here";</script>
+<table class="tb_base  tb_dados">
+  <thead><tr><th>Produto</th><th>Quantidade (L.)</th><th>Valor</th></tr></thead>
+  <tbody>
+    <tr>
+      <td class="tb_item">
+        VINHO DE MESA
+      </td>
+      <td class="tb_item">  169.762.429 </td>
+      <td class="tb_item">-</td>
+    </tr>
+    <tr>
+      <td class="tb_subitem">Vinho&nbsp;Fino &amp; Tinto</td>
+      <td class="tb_subitem"><b>1.</b>234<!-- note --> </td>
+      <td class="tb_subitem"><span> 56</span><br>7</td>
+    </tr>
+    <tr><td class="tb_subitem">Only one column</td></tr>
+    <tr>
+      <td class="tb_item">SUCO</td>
+      <td class="tb_item">1.000</td>
+    </tr>
+    <tr>
+      <td class="tb_subitem">  Suco de uva integral </td>
+      <td class="tb_subitem"><i>4</i>.<i>500</i></td>
+    </tr>
+    <tr>
+      <td>África do Sul</td>
+      <td>0</td>
+      <td>12</td>
+    </tr>
+  </tbody>
+  <tfoot class="tb_total"><tr><td>Total</td><td>999</td><td>1</td></tr></tfoot>
+</table>
+</body></html>
+"""
+
+PARSERS = [
+    (parse_export_row, (3, 3)),
+    (parse_import_row, (3, 3)),
+    (parse_processing_row, (2, 2)),
+    (parse_production_row, (2, 2)),
+    (parse_commercialization_row, (2, 2)),
+    (parse_production_row, (2, 3)),
+]
+
+
+@pytest.mark.parametrize("parse_row_fn, expected_col_range", PARSERS)
+def test_fast_backend_matches_beautifulsoup(monkeypatch, parse_row_fn, expected_col_range):
+    results = {}
+    for backend in ("fast", "bs4"):
+        monkeypatch.setattr(utils, "extract_table_rows", lambda html, b=backend: extract_table_rows(html, b))
+        results[backend] = utils.parse_table_data(PAGE, 2023, parse_row_fn, expected_col_range)
+
+    assert results["fast"]
+    assert results["fast"] == results["bs4"]
+
+
+@pytest.mark.parametrize("backend", ["fast", "bs4"])
+def test_missing_table_raises_value_error(backend):
+    with pytest.raises(ValueError, match="Data table not found"):
+        extract_table_rows("<html><table class='tb_base'></table></html>", backend)
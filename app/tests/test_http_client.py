@@ -0,0 +1,45 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.core.http_client import close_session, create_session, get_session
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    client_ports = set()
+
+    def do_GET(self):
+        self.client_ports.add(self.client_address[1])
+        body = b"<html></html>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_session_reuses_connections():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    session = create_session(pool_size=2)
+
+    try:
+        for year in range(1970, 1980):
+            response = session.get(f"http://127.0.0.1:{server.server_port}/?ano={year}", timeout=5)
+            assert response.status_code == 200
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+    assert len(KeepAliveHandler.client_ports) == 1
+
+
+def test_get_session_is_shared_until_closed():
+    session = get_session()
+    assert get_session() is session
+
+    close_session()
+    assert get_session() is not session
@@ -0,0 +1,49 @@
+import pytest
+
+from app.core.binary_dataset import read_dataset, table_from_rows, write_dataset
+from app.core.constants import EXPORT_CATEGORY_MAP, EXPORT_CSV_COLUMNS, PRODUCTION_CSV_COLUMNS, PRODUCTION_CSV_PATH
+from app.core.utils import load_from_csv
+
+np = pytest.importorskip("numpy")
+
+from app.core.matrix import build_matrix, get_csv_matrix  # noqa: E402
+
+
+def test_export_matrix_matches_csv_rows():
+    csv_path = EXPORT_CATEGORY_MAP["vinhos"]["data_path"]
+    matrix = get_csv_matrix(csv_path, EXPORT_CSV_COLUMNS[0])
+    rows = {row["País"]: row for row in load_from_csv(csv_path, 2020, EXPORT_CSV_COLUMNS)}
+    year = matrix.slice_year(2020)
+
+    assert matrix.amount.dtype == np.int64
+    assert matrix.amount.shape == matrix.value.shape == (len(matrix.labels), len(matrix.years))
+    for label, amount, value in zip(matrix.labels, year["amount"], year["value"]):
+        assert amount == int(rows[label]["2020_1"])
+        assert value == int(rows[label]["2020_2"])
+
+
+def test_production_matrix_tracks_groups_and_sums_years():
+    matrix = get_csv_matrix(PRODUCTION_CSV_PATH, PRODUCTION_CSV_COLUMNS[0])
+    tinto = list(matrix.labels).index("Tinto")
+
+    assert matrix.value is None
+    assert matrix.is_group[0] and matrix.groups[tinto] == "VINHO DE MESA"
+    assert matrix.totals(2000, 2001)["amount"][tinto] == matrix.amount[tinto, 30:32].sum()
+
+
+def test_binary_matrix_is_a_view_of_the_mapped_file(tmp_path):
+    csv_path = EXPORT_CATEGORY_MAP["vinhos"]["data_path"]
+    rows_by_year = {year: load_from_csv(csv_path, year, EXPORT_CSV_COLUMNS) for year in (2019, 2020)}
+    path = str(tmp_path / "dataset.bin")
+    write_dataset(path, [table_from_rows(csv_path, "export", "vinhos", "País", rows_by_year)], "csv")
+
+    table = read_dataset(path).tables[csv_path]
+    matrix = build_matrix(table, EXPORT_CSV_COLUMNS[0])
+    expected = get_csv_matrix(csv_path, EXPORT_CSV_COLUMNS[0])
+    columns = [list(expected.years).index(year) for year in (2019, 2020)]
+
+    assert not matrix.amount.flags.owndata
+    assert not matrix.amount.flags.writeable
+    assert matrix.amount.shape == (table.row_count, 2)
+    assert (matrix.amount == expected.amount[:, columns]).all()
+    assert (matrix.value == expected.value[:, columns]).all()
@@ -0,0 +1,56 @@
+from http import HTTPStatus
+
+import pytest
+
+from app.core.metrics import SCRAPE_OUTCOMES, Counter, Histogram, route_template, track_fallback
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", ["stage"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="parse")
+    histogram.observe(0.5, stage="parse")
+    histogram.observe(5, stage="parse")
+
+    lines = histogram.collect()
+    assert 'test_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="parse",le="1"} 2' in lines
+    assert 'test_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="parse"} 3' in lines
+
+
+def test_counter_escapes_label_values():
+    counter = Counter("test_total", "Test.", ["tab"])
+    counter.inc(tab='a"b')
+    counter.inc(2, tab='a"b')
+
+    assert counter.collect()[-1] == 'test_total{tab="a\\"b"} 3'
+
+
+def test_track_fallback_counts_fallbacks_and_errors():
+    labels = {"tab": "test", "category": "fallback"}
+
+    with track_fallback("test", "fallback"):
+        pass
+    with pytest.raises(OSError):
+        with track_fallback("test", "fallback"):
+            raise OSError("missing csv")
+
+    assert SCRAPE_OUTCOMES.value(outcome="fallback", **labels) == 1
+    assert SCRAPE_OUTCOMES.value(outcome="error", **labels) == 1
+
+
+def test_route_template_restores_path_parameters():
+    scope = {"path": "/export/vinhos/2020", "endpoint": object(), "path_params": {"category": "vinhos", "year": 2020}}
+
+    assert route_template(scope) == "/export/{category}/{year}"
+    assert route_template({"path": "/missing"}) == "unmatched"
+
+
+def test_metrics_endpoint(client):
+    client.get("/production/2020")
+    response = client.get("/metrics")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'vitibrasil_http_request_duration_seconds_count{method="GET",route="/production/{year}",status="200"}' in response.text
+    assert "vitibrasil_stage_duration_seconds" in response.text
@@ -1,4 +1,7 @@
 from http import HTTPStatus
+
+import pytest
+
 from .constants import (
     PROCESSING_VALID_CATEGORY,
     INVALID_CATEGORY,
@@ -48,3 +51,39 @@ def test_get_all_processing_data(client):
         assert all("type" in item for item in data)
         assert all("category" in item for item in data)
         assert all("year" in item for item in data)
+
+
+def test_get_processing_data_type_filter(client):
+    response = client.get(
+        f"{BASE_PROCESSING_URL}/{PROCESSING_VALID_CATEGORY}/{VALID_YEAR}",
+        params={"type": "tintas", "top": 5},
+    )
+    assert response.status_code in [HTTPStatus.OK, HTTPStatus.NO_CONTENT]
+    if response.status_code == HTTPStatus.OK:
+        data = response.json()
+        assert len(data) <= 5
+        assert all(item["type"] == "TINTAS" for item in data)
+
+
+def test_get_processing_data_filter_and_sort_share_the_field_name(client):
+    response = client.get(
+        f"{BASE_PROCESSING_URL}/{PROCESSING_VALID_CATEGORY}/{VALID_YEAR}",
+        params={"cultivate": ["Cabernet Franc", "merlot"], "sort_by": "cultivate", "order": "asc"},
+    )
+    assert response.status_code in [HTTPStatus.OK, HTTPStatus.NO_CONTENT]
+    if response.status_code == HTTPStatus.OK:
+        data = response.json()
+        assert {item["cultivate"].casefold() for item in data} <= {"cabernet franc", "merlot"}
+        assert [item["cultivate"] for item in data] == sorted(item["cultivate"] for item in data)
+
+
+def test_get_processing_range_matches_year_route_for_decimal_cells(client):
+    pytest.importorskip("numpy")
+    year = client.get(f"{BASE_PROCESSING_URL}/viniferas/2023", params={"limit": 1000})
+    series = client.get(f"{BASE_PROCESSING_URL}/viniferas", params={"start": 2023, "end": 2023})
+    assert year.status_code == series.status_code == HTTPStatus.OK
+
+    by_year = {item["cultivate"]: item["amount"] for item in year.json()}
+    by_range = {item["cultivate"]: item["amount"][0] for item in series.json()["items"]}
+    assert by_range == by_year
+    assert by_range["Alicante Bouschet"] == 4108858
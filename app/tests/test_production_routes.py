@@ -1,4 +1,15 @@
+import asyncio
+import time
 from http import HTTPStatus
+
+import httpx
+import pytest
+
+from app.core import utils
+from app.core.cache import scrape_cache
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.snapshot_store import SnapshotStore
+from app.main import app
 from .constants import (
     VALID_YEAR,
     INVALID_YEAR_LOW,
@@ -36,4 +47,78 @@ def test_get_all_production_data(client):
         assert all("product" in item for item in data)
         assert all("amount" in item for item in data)
         assert all("type" in item for item in data)
-        assert all("year" in item for item in data)
\ No newline at end of file
+        assert all("year" in item for item in data)
+
+
+def test_get_production_data_not_modified(client):
+    response = client.get(f"{BASE_PRODUCTION_URL}/{VALID_YEAR}")
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["cache-control"].startswith("public")
+
+    cached = client.get(f"{BASE_PRODUCTION_URL}/{VALID_YEAR}", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert cached.content == b""
+
+    since = client.get(f"{BASE_PRODUCTION_URL}/{VALID_YEAR}", headers={"If-Modified-Since": response.headers["last-modified"]})
+    assert since.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_get_production_data_range(client):
+    pytest.importorskip("numpy")
+    response = client.get(f"{BASE_PRODUCTION_URL}/range", params={"start": 2019, "end": VALID_YEAR, "deltas": True})
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data["years"] == [2019, 2020]
+    assert all("type" in item for item in data["items"])
+    assert all(len(item["amount_change"]) == 2 for item in data["items"])
+
+def test_concurrent_production_requests_are_served_in_parallel(monkeypatch):
+    delay = 0.5
+    fetched = []
+
+    def slow_fetch_page(url):
+        fetched.append(url)
+        time.sleep(delay)
+        raise ConnectionError("upstream unavailable")
+
+    years = range(VALID_YEAR - 4, VALID_YEAR + 1)
+    for year in years:
+        scrape_cache.invalidate(("production", None, year))
+    # Earlier tests leave the shared breaker open, which would skip the fetch entirely.
+    monkeypatch.setattr(utils, "upstream_breaker", CircuitBreaker("test", failure_threshold=100))
+    monkeypatch.setattr(utils, "snapshot_store", SnapshotStore(enabled=False))
+    monkeypatch.setattr(utils, "fetch_page", slow_fetch_page)
+
+    async def fetch_years(years):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(
+                *(async_client.get(f"{BASE_PRODUCTION_URL}/{year}") for year in years)
+            )
+
+    started = time.perf_counter()
+    responses = asyncio.run(fetch_years(years))
+    elapsed = time.perf_counter() - started
+
+    assert all(response.status_code == HTTPStatus.OK for response in responses)
+    assert len(fetched) == len(years)
+    assert elapsed < delay * len(years) / 2
+
+
+def test_get_production_data_not_modified_skips_the_scrape(client, monkeypatch):
+    from app.api import production_tab_routes
+
+    year = VALID_YEAR - 1
+    scrape_cache.set(("production", None, year), [{"produto": "VINHO DE MESA", str(year): "10"}, {"produto": "Tinto", str(year): "10"}])
+    try:
+        response = client.get(f"{BASE_PRODUCTION_URL}/{year}")
+        assert response.status_code == HTTPStatus.OK
+
+        async def fail(year):
+            raise AssertionError("conditional request should not load data")
+
+        monkeypatch.setattr(production_tab_routes, "get_production_data", fail)
+        cached = client.get(f"{BASE_PRODUCTION_URL}/{year}", headers={"If-None-Match": response.headers["etag"]})
+        assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    finally:
+        scrape_cache.invalidate(("production", None, year))
@@ -0,0 +1,57 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.profiling import ProfilingMiddleware, StackSampler
+
+
+def busy_format_rows(seconds: float) -> int:
+    total = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+def make_client(**options) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, interval=0.001, **options)
+
+    @app.get("/slow")
+    def slow():
+        busy_format_rows(0.1)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_sampler_records_collapsed_stacks():
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    busy_format_rows(0.05)
+    sampler.stop()
+
+    profile = sampler.collapsed()
+    assert sampler.samples > 0
+    assert any("busy_format_rows" in line and line.rsplit(" ", 1)[1].isdigit() for line in profile.splitlines())
+
+
+def test_profile_is_returned_for_admin_token():
+    client = make_client(token="secret")
+
+    response = client.get("/slow", headers={"X-Profile-Token": "secret"})
+    assert response.headers["x-profiled-status"] == "200"
+    assert "busy_format_rows" in response.text
+
+    assert client.get("/slow", headers={"X-Profile-Token": "wrong"}).json() == {"ok": True}
+
+
+def test_sampled_requests_are_stored(tmp_path):
+    client = make_client(sample_rate=1.0, output_dir=str(tmp_path))
+
+    assert client.get("/slow").json() == {"ok": True}
+
+    profiles = list(tmp_path.glob("*-slow.folded"))
+    assert len(profiles) == 1
+    assert "busy_format_rows" in profiles[0].read_text(encoding="utf-8")
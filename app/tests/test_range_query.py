@@ -0,0 +1,48 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.matrix import TabMatrix  # noqa: E402
+from app.core.range_query import summarize_range  # noqa: E402
+
+
+def make_matrix():
+    amount = np.array([
+        [0, 0, 0],
+        [1, 2, 4],
+        [5, 5, 0],
+        [0, 0, 0],
+    ], dtype=np.int64)
+    return TabMatrix(
+        labels=["TINTO", "Bordo", "Isabel", "Merlot"],
+        groups=["TINTO", "TINTO", "TINTO", "TINTO"],
+        is_group=[True, False, False, False],
+        years=[2000, 2001, 2002],
+        amount=amount,
+    )
+
+
+def test_summarize_range_skips_groups_and_empty_items():
+    summary = summarize_range(make_matrix(), 2001, 2002, "cultivate", totals=True)
+
+    assert summary["years"] == [2001, 2002]
+    assert summary["items"] == [
+        {"cultivate": "Bordo", "type": "TINTO", "amount": [2, 4], "total_amount": 6},
+        {"cultivate": "Isabel", "type": "TINTO", "amount": [5, 0], "total_amount": 5},
+    ]
+
+
+def test_summarize_range_deltas_use_previous_year_when_available():
+    matrix = make_matrix()
+
+    inner = summarize_range(matrix, 2001, 2002, "cultivate", deltas=True)
+    assert inner["items"][0]["amount_change"] == [1, 2]
+
+    full = summarize_range(matrix, 2000, 2002, "cultivate", deltas=True)
+    assert full["items"][0]["amount_change"] == [None, 1, 2]
+
+
+def test_summarize_range_top_orders_by_total_amount():
+    summary = summarize_range(make_matrix(), 2000, 2002, "cultivate", top=1)
+
+    assert [item["cultivate"] for item in summary["items"]] == ["Isabel"]
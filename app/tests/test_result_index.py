@@ -0,0 +1,45 @@
+from app.core.constants import EXPORT_CATEGORY_MAP, EXPORT_CSV_COLUMNS
+from app.core.result_index import ResultIndex
+from app.core.utils import load_from_csv
+from app.scraping.export_tab import format_export_data
+
+KEY = ("export", "vinhos", 2020, False)
+
+
+def test_rows_are_formatted_once_per_source():
+    index = ResultIndex()
+    source = load_from_csv(EXPORT_CATEGORY_MAP["vinhos"]["data_path"], 2020, EXPORT_CSV_COLUMNS)
+    builds = []
+
+    def build(rows):
+        builds.append(rows)
+        return format_export_data(rows, 2020)
+
+    first = index.get(KEY, source, build)
+    second = index.get(KEY, load_from_csv(EXPORT_CATEGORY_MAP["vinhos"]["data_path"], 2020, EXPORT_CSV_COLUMNS), build)
+
+    assert first is second
+    assert len(builds) == 1
+    assert all(isinstance(item["amount"], int) for item in first)
+    assert index.stats()["hits"] == 1
+
+
+def test_replaced_source_rebuilds_entry():
+    index = ResultIndex()
+    old_source = [{"País": "Brasil", "2020_1": "1", "2020_2": "2"}]
+    new_source = [{"País": "Brasil", "2020_1": "3", "2020_2": "4"}]
+    build = lambda rows: format_export_data(rows, 2020)
+
+    index.get(KEY, old_source, build)
+    rows = index.get(KEY, new_source, build)
+
+    assert rows == [{"country": "Brasil", "amount": 3, "value": 4}]
+    assert index.stats()["builds"] == 2
+
+
+def test_lru_bound():
+    index = ResultIndex(maxsize=1)
+    index.get(("a",), [], lambda rows: [])
+    index.get(("b",), [], lambda rows: [])
+
+    assert index.stats()["size"] == 1
@@ -0,0 +1,33 @@
+from app.core.row_query import RowIndex, query_rows, sort_rows
+
+ROWS = [
+    {"cultivate": "Bordo", "amount": 30, "type": "TINTAS"},
+    {"cultivate": "Isabel", "amount": 50, "type": "TINTAS"},
+    {"cultivate": "Niagara", "amount": 10, "type": "BRANCAS"},
+    {"cultivate": "Bordo", "amount": 5, "type": "BRANCAS"},
+]
+
+
+def test_select_matches_labels_and_types_case_insensitively():
+    index = RowIndex(ROWS, "cultivate")
+
+    assert index.select() is ROWS
+    assert index.select(labels=["bordo"]) == [ROWS[0], ROWS[3]]
+    assert index.select(types=["brancas"]) == [ROWS[2], ROWS[3]]
+    assert index.select(labels=["BORDO"], types=["Tintas"]) == [ROWS[0]]
+    assert index.select(labels=["unknown"]) == []
+
+
+def test_sort_rows_top_n_matches_full_sort():
+    full = sort_rows(ROWS, "amount")
+
+    assert [row["amount"] for row in full] == [50, 30, 10, 5]
+    assert sort_rows(ROWS, "amount", top=2) == full[:2]
+    assert sort_rows(ROWS, "amount", descending=False, top=1) == [ROWS[3]]
+
+
+def test_query_rows_defaults_top_to_amount():
+    index = RowIndex(ROWS, "cultivate")
+
+    assert query_rows(index, types=["tintas"], top=1) == [ROWS[1]]
+    assert query_rows(index, sort_by="cultivate", order="asc")[0]["cultivate"] == "Bordo"
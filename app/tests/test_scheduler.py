@@ -0,0 +1,95 @@
+import asyncio
+
+from app.core.cache import ScrapeCache
+from app.core.scheduler import RefreshScheduler
+from app.core.snapshot_store import SnapshotStore
+
+TARGETS = [("export", "vinhos", 2000), ("export", "vinhos", 2001), ("production", None, 2000)]
+
+
+def test_refresh_once_only_refreshes_keys_about_to_expire():
+    cache = ScrapeCache(closed_year_ttl=10_000)
+    cache.set(TARGETS[0], ["fresh"])
+    refreshed = []
+
+    async def refresh(target):
+        refreshed.append(target)
+        cache.set(target, ["refreshed"])
+
+    scheduler = RefreshScheduler(lambda: TARGETS, refresh, cache=cache, interval=60, jitter=0)
+    count = asyncio.run(scheduler.refresh_once())
+
+    assert count == 2
+    assert refreshed == TARGETS[1:]
+    assert asyncio.run(scheduler.refresh_once()) == 0
+
+
+def test_refresh_failures_are_counted_and_do_not_raise():
+    cache = ScrapeCache()
+
+    async def refresh(target):
+        raise ConnectionError("upstream down")
+
+    scheduler = RefreshScheduler(lambda: TARGETS, refresh, cache=cache, interval=60, jitter=0)
+
+    assert asyncio.run(scheduler.refresh_once()) == 0
+    assert cache.stats()["size"] == 0
+
+
+def test_scheduler_runs_in_background_until_stopped():
+    cache = ScrapeCache()
+    refreshed = []
+
+    async def refresh(target):
+        refreshed.append(target)
+        cache.set(target, [])
+
+    async def run():
+        scheduler = RefreshScheduler(lambda: TARGETS, refresh, cache=cache, interval=60, jitter=0)
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    assert sorted(refreshed, key=str) == sorted(TARGETS, key=str)
+
+
+def test_cold_keys_are_warmed_and_cached_keys_refreshed():
+    cache = ScrapeCache(closed_year_ttl=30)
+    cache.set(TARGETS[0], ["stale"])
+    warmed, refreshed = [], []
+
+    async def warm(target):
+        warmed.append(target)
+        cache.set(target, [])
+
+    async def refresh(target):
+        refreshed.append(target)
+        cache.set(target, [])
+
+    scheduler = RefreshScheduler(lambda: TARGETS, refresh, cache=cache, interval=60, jitter=0, warm_fn=warm)
+    asyncio.run(scheduler.refresh_once())
+
+    assert refreshed == TARGETS[:1]
+    assert warmed == TARGETS[1:]
+
+
+def test_only_the_lease_holder_refreshes(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    refreshed = []
+
+    async def refresh(target):
+        refreshed.append(target)
+
+    def make_scheduler():
+        return RefreshScheduler(lambda: TARGETS, refresh, cache=ScrapeCache(), interval=60, jitter=0, lease_store=store)
+
+    leader, follower = make_scheduler(), make_scheduler()
+
+    assert asyncio.run(leader.refresh_once()) == len(TARGETS)
+    assert asyncio.run(follower.refresh_once()) == 0
+    assert len(refreshed) == len(TARGETS)
+
+    asyncio.run(leader.stop())
+    assert follower.holds_lease()
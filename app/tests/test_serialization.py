@@ -0,0 +1,43 @@
+import pytest
+from fastapi.responses import JSONResponse
+
+from app.core import serialization
+from app.core.serialization import FastJSONResponse, get_response_class, json_response
+
+ROWS = [
+    {"country": "África do Sul", "amount": 1200, "value": 3400, "year": 2020, "category": "Vinhos de mesa"},
+    {"product": "Suco de uva", "amount": 0, "type": "SUCO"},
+]
+
+
+def test_fast_json_response_matches_standard_output():
+    pytest.importorskip("orjson")
+
+    assert FastJSONResponse(ROWS).body == JSONResponse(ROWS).body
+    assert FastJSONResponse({"items": ROWS, "years": [2019, 2020]}).body == JSONResponse({"items": ROWS, "years": [2019, 2020]}).body
+
+
+def test_response_class_is_opt_in(monkeypatch):
+    monkeypatch.setattr(serialization, "FAST_JSON_ENABLED", False)
+    assert get_response_class() is JSONResponse
+
+    monkeypatch.setattr(serialization, "FAST_JSON_ENABLED", True)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert get_response_class() is JSONResponse
+
+
+def test_fast_json_route_output_is_identical(client, monkeypatch):
+    pytest.importorskip("orjson")
+    standard = client.get("/export/vinhos/2020", params={"limit": 1000})
+
+    monkeypatch.setattr(serialization, "FAST_JSON_ENABLED", True)
+    fast = client.get("/export/vinhos/2020", params={"limit": 1000})
+
+    assert fast.status_code == standard.status_code
+    assert fast.content == standard.content
+    assert fast.headers["etag"] == standard.headers["etag"]
+
+
+def test_json_response_keeps_headers():
+    response = json_response([], headers={"ETag": 'W/"abc"'})
+    assert response.headers["etag"] == 'W/"abc"'
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from app.core import utils
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.single_flight import SingleFlight
+from app.core.snapshot_store import SnapshotStore
+from app.scraping.production_tab import parse_production_row
+
+PAGE = """
+<table class="tb_base tb_dados"><tbody>
+<tr><td class="tb_subitem">Tinto</td><td class="tb_subitem">1.000</td></tr>
+</tbody></table>
+"""
+
+
+def test_concurrent_scrapes_of_same_url_share_one_fetch(monkeypatch):
+    calls = []
+
+    def slow_fetch(url):
+        calls.append(url)
+        time.sleep(0.2)
+        return PAGE
+
+    monkeypatch.setattr(utils, "fetch_page", slow_fetch)
+    monkeypatch.setattr(utils, "upstream_breaker", CircuitBreaker("test"))
+    monkeypatch.setattr(utils, "scrape_flights", SingleFlight())
+
+    async def scrape_many():
+        return await asyncio.gather(*(
+            utils.scrape_table_data_from_site(
+                "http://upstream.test/?ano=2023", 2023, parse_production_row, (2, 2), use_snapshot=False
+            )
+            for _ in range(20)
+        ))
+
+    results = asyncio.run(scrape_many())
+
+    assert len(calls) == 1
+    assert all(result == [{"produto": "Tinto", "2023": "1.000"}] for result in results)
+    assert utils.scrape_flights.stats() == {"calls": 1, "coalesced": 19, "in_flight": 0}
+
+
+def test_refresh_and_snapshot_miss_of_same_url_share_one_fetch(monkeypatch):
+    calls = []
+
+    def slow_fetch(url):
+        calls.append(url)
+        time.sleep(0.2)
+        return PAGE
+
+    monkeypatch.setattr(utils, "fetch_page", slow_fetch)
+    monkeypatch.setattr(utils, "upstream_breaker", CircuitBreaker("test"))
+    monkeypatch.setattr(utils, "snapshot_store", SnapshotStore(enabled=False))
+    monkeypatch.setattr(utils, "scrape_flights", SingleFlight())
+
+    async def scrape_both():
+        return await asyncio.gather(*(
+            utils.scrape_table_data_from_site(
+                "http://upstream.test/?ano=2023", 2023, parse_production_row, (2, 2), use_snapshot=use_snapshot
+            )
+            for use_snapshot in (False, True)
+        ))
+
+    results = asyncio.run(scrape_both())
+
+    assert len(calls) == 1
+    assert results[0] == results[1] == [{"produto": "Tinto", "2023": "1.000"}]
+
+
+def test_failures_are_shared_and_not_remembered():
+    flights = SingleFlight()
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        raise ConnectionError("upstream down")
+
+    async def run():
+        first = await asyncio.gather(*(flights.do("key", flaky) for _ in range(5)), return_exceptions=True)
+        second = await asyncio.gather(flights.do("key", flaky), return_exceptions=True)
+        return first + second
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert len(attempts) == 2
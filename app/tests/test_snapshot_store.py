@@ -0,0 +1,39 @@
+import asyncio
+
+from app.core import utils
+from app.core.snapshot_store import SnapshotStore
+from app.scraping.production_tab import parse_production_row
+
+URL = "http://vitibrasil.cnpuv.embrapa.br/index.php?ano=2000&opcao=opt_02"
+ROWS = [{"produto": "Tinto", "2000": "1.000"}]
+
+
+def test_snapshot_is_shared_between_store_instances(tmp_path):
+    db_path = str(tmp_path / "snapshots.sqlite3")
+    SnapshotStore(db_path).save(URL, ROWS)
+
+    assert SnapshotStore(db_path).load(URL, max_age=60) == ROWS
+
+
+def test_stale_snapshot_is_ignored(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    store.save(URL, ROWS)
+
+    assert store.load(URL, max_age=-1) is None
+
+
+def test_scrape_serves_fresh_snapshot_without_fetching(tmp_path, monkeypatch):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"))
+    store.save(URL, ROWS)
+    monkeypatch.setattr(utils, "snapshot_store", store)
+
+    def fail_fetch(url):
+        raise AssertionError("upstream should not be called")
+
+    monkeypatch.setattr(utils, "fetch_page", fail_fetch)
+
+    data = asyncio.run(
+        utils.scrape_table_data_from_site(URL, 2000, parse_production_row, (2, 2))
+    )
+
+    assert data == ROWS
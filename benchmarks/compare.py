@@ -0,0 +1,43 @@
+"""Compare two ``benchmarks.run --output`` files and flag p50 regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return {result["name"]: result for result in json.load(f)["results"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p50 slowdown in percent")
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    candidate = load(args.candidate)
+
+    regressions = 0
+    print(f"{'benchmark':<48} {'base p50':>9} {'new p50':>9} {'change':>8}")
+    for name, result in candidate.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["p50_ms"]
+        after = result["p50_ms"]
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{name:<48} {before:>9.3f} {after:>9.3f} {change:>+7.1f}%{flag}")
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
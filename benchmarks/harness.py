@@ -0,0 +1,83 @@
+import math
+import time
+import tracemalloc
+from typing import Awaitable, Callable, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def summarize(name: str, samples: List[float], peak_bytes: int) -> dict:
+    total = sum(samples)
+    return {
+        "name": name,
+        "iterations": len(samples),
+        "throughput_per_s": len(samples) / total if total else float("inf"),
+        "mean_ms": total / len(samples) * 1000,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "peak_memory_kb": peak_bytes / 1024,
+    }
+
+
+def bench(
+    name: str,
+    fn: Callable[[], object],
+    iterations: int,
+    warmup: int = 3,
+    setup: Optional[Callable[[], object]] = None,
+) -> dict:
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return summarize(name, samples, peak)
+
+
+async def abench(
+    name: str,
+    fn: Callable[[], Awaitable[object]],
+    iterations: int,
+    warmup: int = 3,
+    setup: Optional[Callable[[], object]] = None,
+) -> dict:
+    for _ in range(warmup):
+        if setup:
+            setup()
+        await fn()
+
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    await fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return summarize(name, samples, peak)
@@ -0,0 +1,137 @@
+"""Record Embrapa pages used by the benchmark suite.
+
+Run ``python -m benchmarks.record_fixtures`` to fetch the live pages. When the
+site is unreachable, ``--from-csv`` renders the same table markup from the
+bundled CSVs so the suite stays reproducible offline.
+"""
+import argparse
+import os
+from urllib.parse import parse_qs, urlparse
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FIXTURE_YEAR = 2021
+
+# (tab, category, opcao, subopcao)
+FIXTURES = [
+    ("production", None, "opt_02", None),
+    ("processing", "viniferas", "opt_03", "subopt_01"),
+    ("commercialization", None, "opt_04", None),
+    ("import", "vinhos", "opt_05", "subopt_01"),
+    ("export", "vinhos", "opt_06", "subopt_01"),
+]
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="pt-br">
+<head>
+<meta charset="utf-8">
+<title>Banco de dados de uva, vinho e derivados</title>
+<link rel="stylesheet" href="css/estilo.css">
+<script type="text/javascript" src="js/funcoes.js"></script>
+</head>
+<body>
+<div id="cabecalho"><a href="index.php"><img src="img/logo_embrapa.png" alt="Embrapa"></a></div>
+<div id="menu">{menu}</div>
+<div class="content_center">
+<table class="tb_base">
+<tr><td><form method="post" action="index.php?opcao={opcao}">Ano: <input type="text" name="ano" value="{year}"></form></td></tr>
+</table>
+<table class="tb_base tb_dados">
+<thead><tr>{header}</tr></thead>
+<tbody>
+{rows}
+</tbody>
+<tfoot class="tb_total"><tr><td>Total</td>{total}</tr></tfoot>
+</table>
+</div>
+<div id="rodape">{footer}</div>
+</body>
+</html>
+"""
+
+
+def fixture_name(opcao: str, subopcao: str = None) -> str:
+    return f"{opcao}_{subopcao}.html" if subopcao else f"{opcao}.html"
+
+
+def fixture_name_for_url(url: str) -> str:
+    query = parse_qs(urlparse(url).query)
+    return fixture_name(query["opcao"][0], query.get("subopcao", [None])[0])
+
+
+def fixture_url(tab: str, category: str, year: int = FIXTURE_YEAR) -> str:
+    from app.core import constants
+
+    base_url = getattr(constants, f"{tab.upper()}_BASE_URL")
+    if category is None:
+        return base_url.format(year=year)
+    category_map = getattr(constants, f"{tab.upper()}_CATEGORY_MAP")
+    return base_url.format(year=year, suboption=category_map[category]["suboption"])
+
+
+def _format_number(value: str) -> str:
+    value = value.replace(".", "")
+    if not value or value == "0" or value == "-":
+        return "-"
+    if not value.isdigit():
+        return value
+    return f"{int(value):,}".replace(",", ".")
+
+
+def render_from_csv(tab: str, category: str, opcao: str) -> str:
+    from app.core import constants
+    from app.core.utils import load_from_csv
+
+    if category is None:
+        csv_path = getattr(constants, f"{tab.upper()}_CSV_PATH")
+    else:
+        csv_path = getattr(constants, f"{tab.upper()}_CATEGORY_MAP")[category]["data_path"]
+    columns = getattr(constants, f"{tab.upper()}_CSV_COLUMNS")
+    data = load_from_csv(csv_path, FIXTURE_YEAR, columns)
+
+    year = str(FIXTURE_YEAR)
+    value_keys = [key for key in data[0] if key.startswith(year)] if data else [year]
+    rows = []
+    for row in data:
+        label = row[columns[0]]
+        css = "tb_item" if label.isupper() else "tb_subitem"
+        cells = [label] + [_format_number(row[key]) for key in value_keys]
+        rows.append(
+            "<tr>\n" + "".join(f'<td class="{css}">\n  {cell}\n</td>\n' for cell in cells) + "</tr>"
+        )
+
+    header = "<th>Item</th>" + "".join("<th>Quantidade</th>" if i == 0 else "<th>Valor (US$)</th>" for i in range(len(value_keys)))
+    menu = "".join(f'<button class="btn_opt" value="opt_0{i}">Opção {i}</button>' for i in range(1, 8))
+    footer = "<p>Embrapa Uva e Vinho</p>" * 20
+    return PAGE_TEMPLATE.format(
+        menu=menu,
+        opcao=opcao,
+        year=FIXTURE_YEAR,
+        header=header,
+        rows="\n".join(rows),
+        total="<td>-</td>" * len(value_keys),
+        footer=footer,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--from-csv", action="store_true", help="Render pages from the bundled CSVs instead of fetching them")
+    args = parser.parse_args()
+
+    from app.core.utils import fetch_page
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for tab, category, opcao, subopcao in FIXTURES:
+        if args.from_csv:
+            html = render_from_csv(tab, category, opcao)
+        else:
+            html = fetch_page(fixture_url(tab, category))
+
+        path = os.path.join(FIXTURE_DIR, fixture_name(opcao, subopcao))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"Wrote {path} ({len(html)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Benchmark the scrape, parse, CSV fallback, format, serialization and route hot paths.
+
+Pages are served from ``benchmarks/fixtures`` by a local stand-in for the
+Embrapa site, so results are reproducible and never touch the network.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks.harness import abench, bench
+from benchmarks.record_fixtures import FIXTURE_DIR, FIXTURE_YEAR, FIXTURES, fixture_name, fixture_url
+from benchmarks.stand_in import start_stand_in
+
+
+def tab_functions():
+    from app.scraping.commercialization_tab import format_commercialization_data, parse_commercialization_row
+    from app.scraping.export_tab import format_export_data, parse_export_row
+    from app.scraping.import_tab import format_import_data, parse_import_row
+    from app.scraping.processing_tab import format_processing_data, parse_processing_row
+    from app.scraping.production_tab import format_production_data, parse_production_row
+
+    return {
+        "production": (parse_production_row, (2, 2), format_production_data),
+        "processing": (parse_processing_row, (2, 2), format_processing_data),
+        "commercialization": (parse_commercialization_row, (2, 2), format_commercialization_data),
+        "import": (parse_import_row, (3, 3), format_import_data),
+        "export": (parse_export_row, (3, 3), format_export_data),
+    }
+
+
+def load_fixture(opcao, subopcao):
+    with open(os.path.join(FIXTURE_DIR, fixture_name(opcao, subopcao)), encoding="utf-8") as f:
+        return f.read()
+
+
+def bench_parse_and_format(iterations):
+    from app.core import utils
+    from app.core.html_table import extract_table_rows
+
+    results = []
+    functions = tab_functions()
+    for tab, category, opcao, subopcao in FIXTURES:
+        html = load_fixture(opcao, subopcao)
+        parse_row_fn, col_range, format_fn = functions[tab]
+
+        original = utils.extract_table_rows
+        for backend in ("fast", "bs4"):
+            utils.extract_table_rows = lambda page, b=backend: extract_table_rows(page, b)
+            results.append(bench(
+                f"parse/{tab}/{backend}",
+                lambda: utils.parse_table_data(html, FIXTURE_YEAR, parse_row_fn, col_range),
+                iterations,
+            ))
+        utils.extract_table_rows = original
+
+        data = utils.parse_table_data(html, FIXTURE_YEAR, parse_row_fn, col_range)
+        results.append(bench(f"format/{tab}", lambda: format_fn(data, FIXTURE_YEAR), iterations))
+
+    return results
+
+
+def bench_csv(iterations):
+    from app.core.constants import EXPORT_CATEGORY_MAP, EXPORT_CSV_COLUMNS
+    from app.core.dataset_store import clear_csv_datasets
+    from app.core.utils import load_from_csv
+
+    csv_path = EXPORT_CATEGORY_MAP["vinhos"]["data_path"]
+    load = lambda: load_from_csv(csv_path, FIXTURE_YEAR, EXPORT_CSV_COLUMNS)
+    return [
+        bench("csv/load_from_csv/cold", load, iterations, setup=clear_csv_datasets),
+        bench("csv/load_from_csv/warm", load, iterations),
+    ]
+
+
+def all_rows(limit=1000):
+    from app.core.constants import EXPORT_CATEGORY_MAP, EXPORT_CSV_COLUMNS, EXPORT_END_YEAR, EXPORT_START_YEAR
+    from app.core.utils import load_from_csv
+    from app.scraping.export_tab import format_export_data
+
+    rows = []
+    for category, config in EXPORT_CATEGORY_MAP.items():
+        for year in range(EXPORT_START_YEAR, EXPORT_END_YEAR + 1):
+            data = load_from_csv(config["data_path"], year, EXPORT_CSV_COLUMNS)
+            rows += format_export_data(data, year, config["name"], include_year_and_category=True)
+            if len(rows) >= limit:
+                return rows[:limit]
+    return rows
+
+
+def bench_serialization(iterations):
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from app.core.serialization import FastJSONResponse, fast_json_available
+
+    rows = all_rows()
+    results = [
+        bench("serialize/1000/jsonable_encoder+json", lambda: JSONResponse(jsonable_encoder(rows)), iterations),
+        bench("serialize/1000/json", lambda: JSONResponse(rows), iterations),
+    ]
+    if fast_json_available():
+        assert FastJSONResponse(rows).body == JSONResponse(rows).body
+        results.append(bench("serialize/1000/orjson", lambda: FastJSONResponse(rows), iterations))
+    return results
+
+
+async def bench_scrape_and_routes(iterations):
+    import httpx
+
+    from app.core import serialization
+    from app.core.cache import scrape_cache
+    from app.core.serialization import fast_json_available
+    from app.core.utils import scrape_table_data_from_site
+    from app.main import app
+
+    results = []
+    functions = tab_functions()
+    for tab, category, _, _ in FIXTURES:
+        parse_row_fn, col_range, _ = functions[tab]
+        url = fixture_url(tab, category)
+        results.append(await abench(
+            f"scrape/{tab}",
+            lambda: scrape_table_data_from_site(url, FIXTURE_YEAR, parse_row_fn, col_range),
+            iterations,
+        ))
+
+    routes = [
+        (f"/export/vinhos/{FIXTURE_YEAR}", iterations),
+        (f"/production/{FIXTURE_YEAR}", iterations),
+        ("/export/all?limit=1000", max(iterations // 5, 3)),
+        ("/production/all?limit=1000", max(iterations // 5, 3)),
+    ]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def get(path):
+            response = await client.get(path)
+            response.raise_for_status()
+
+        for path, count in routes:
+            results.append(await abench(
+                f"route{path}/cold", lambda: get(path), count, warmup=1, setup=scrape_cache.clear
+            ))
+            results.append(await abench(f"route{path}/warm", lambda: get(path), iterations))
+
+        if fast_json_available():
+            serialization.FAST_JSON_ENABLED = True
+            for path, _ in routes:
+                results.append(await abench(f"route{path}/warm/fast-json", lambda: get(path), iterations))
+            serialization.FAST_JSON_ENABLED = False
+
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(results):
+    print(f"{'benchmark':<48} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak KiB':>10}")
+    for result in results:
+        print(
+            f"{result['name']:<48} {result['throughput_per_s']:>10.1f} {result['p50_ms']:>9.3f} "
+            f"{result['p99_ms']:>9.3f} {result['peak_memory_kb']:>10.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--upstream-latency", type=float, default=20.0, help="Simulated Embrapa latency in ms")
+    parser.add_argument("--filter", default="", help="Only report benchmarks whose name contains this text")
+    parser.add_argument("--output", help="Write machine-readable results to this JSON file")
+    args = parser.parse_args()
+
+    server = start_stand_in(args.upstream_latency / 1000)
+    os.environ["EMBRAPA_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    os.environ["SNAPSHOT_ENABLED"] = "false"
+    os.environ["PREFETCH_ENABLED"] = "false"
+
+    results = []
+    results += bench_parse_and_format(args.iterations)
+    results += bench_csv(args.iterations)
+    results += bench_serialization(args.iterations)
+    results += asyncio.run(bench_scrape_and_routes(args.iterations))
+    results = [result for result in results if args.filter in result["name"]]
+    server.shutdown()
+
+    print_report(results)
+    if args.output:
+        report = {
+            "meta": {
+                "commit": git_commit(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "iterations": args.iterations,
+                "upstream_latency_ms": args.upstream_latency,
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.record_fixtures import FIXTURE_DIR, fixture_name_for_url
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+    pages = {}
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+        try:
+            body = self.pages[fixture_name_for_url(self.path)]
+            self.send_response(200)
+        except KeyError:
+            body = b"not found"
+            self.send_response(404)
+
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in(latency: float = 0.0) -> ThreadingHTTPServer:
+    pages = {}
+    for name in os.listdir(FIXTURE_DIR):
+        with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+            pages[name] = f.read()
+
+    handler = type("Handler", (StandInHandler,), {"latency": latency, "pages": pages})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server